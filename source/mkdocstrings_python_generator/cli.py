@@ -0,0 +1,103 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.exceptions import MkDocsException
+
+from mkdocstrings_python_generator.config import GeneratePythonDocsConfig, SourceConfig
+from mkdocstrings_python_generator.discovery import discover_python_files
+from mkdocstrings_python_generator.edit_url import EditUrlFormatter
+from mkdocstrings_python_generator.files_generator import FilesGenerator
+from mkdocstrings_python_generator.module_scan import ModuleScanner
+from mkdocstrings_python_generator.nav_util import page_nav_path
+from mkdocstrings_python_generator.plugin import MODULE_PAGE, split_modules
+
+log = logging.getLogger(__name__)
+
+PLUGIN_NAME = "mkdocstrings-python-generator"
+
+
+def module_manifest(config: MkDocsConfig) -> Dict[str, Any]:
+    """
+    List every page generated for the modules of every source, without building the site.
+
+    Modules are found, filtered and split just as they are for a build, so the manifest shows exactly which modules
+    are documented, where their pages go and where they appear in the nav.
+    :param config: Whole mkdocs config
+    :return: ``{"sources": [{"base", "package_dir", "modules": [{"module_id", "member", "src_uri", "nav_path",
+        "edit_url"}]}]}``, ``member`` is None except for the member pages of a split module
+    :raises MkDocsException: If the plugin is not configured
+    """
+    plugin = config["plugins"].get(PLUGIN_NAME)
+    if plugin is None:
+        raise MkDocsException(f"The {PLUGIN_NAME} plugin is not configured in {config.config_file_path}")
+    plugin_config: GeneratePythonDocsConfig = plugin.config
+    return {"sources": [_source_manifest(config, source_config) for source_config in plugin_config.source_dirs]}
+
+
+def _source_manifest(config: MkDocsConfig, source_config: SourceConfig) -> Dict[str, Any]:
+    edit_url_formatter = EditUrlFormatter.from_config(config, source_config)
+    nav_path = tuple(source_config.nav_heading)
+    name_space = tuple(source_config.hide_namespace.split(".")) if source_config.hide_namespace else ()
+    module_scanner = ModuleScanner(source_config.skip_undocumented)
+    module_refs = discover_python_files(Path(source_config.base),
+                                        Path(source_config.package_dir or source_config.base),
+                                        source_config.ignore,
+                                        skip_empty=source_config.skip_empty,
+                                        respect_gitignore=source_config.respect_gitignore)
+    # Pages are generated just as a build would, to find the pages of split modules and where they go.  They are only
+    # written to a temporary directory, which also works with mkdocs versions that can't keep pages in memory.
+    generator = FilesGenerator(config["site_dir"], config["use_directory_urls"])
+    try:
+        file_refs = list(edit_url_formatter.resolve(generator.generate_pages(
+            module_scanner.filter(module_refs), MODULE_PAGE, split=split_modules(source_config, module_scanner))))
+    finally:
+        generator.cleanup()
+    modules: List[Dict[str, Any]] = [{
+        "module_id": file_ref.module_ref.module_id,
+        "member": file_ref.member,
+        "src_uri": file_ref.file.src_uri,
+        "nav_path": list(page_nav_path(file_ref, nav_path, name_space)),
+        "edit_url": file_ref.edit_url,
+    } for file_ref in file_refs]
+    return {"base": source_config.base, "package_dir": source_config.package_dir, "modules": modules}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Print the module manifest of a mkdocs project as JSON, see ``module_manifest``
+    :param argv: Command line arguments, ``sys.argv[1:]`` if None
+    :return: Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog=PLUGIN_NAME,
+        description="Print the modules documented by mkdocstrings-python-generator, with the path of their page, "
+                    "their place in the nav and their edit URL, without building the site.",
+    )
+    parser.add_argument("-f", "--config-file", default="mkdocs.yml", help="mkdocs configuration file")
+    parser.add_argument("-o", "--output", help="Write the manifest to this file instead of standard output")
+    parser.add_argument("--indent", type=int, default=None, help="Indent the JSON by this many spaces")
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="%(levelname)-7s -  %(message)s", level=logging.WARNING)
+
+    try:
+        manifest = module_manifest(load_config(args.config_file))
+    except MkDocsException as e:
+        log.error(str(e))
+        return 1
+    if args.output is None:
+        json.dump(manifest, sys.stdout, indent=args.indent)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "wt", encoding="utf8") as output:
+            json.dump(manifest, output, indent=args.indent)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
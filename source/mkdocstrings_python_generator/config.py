@@ -2,6 +2,27 @@ from typing import List, Optional
 
 from mkdocs.config import base, config_options as c
 
+SKIP_EMPTY_ALL = "all"
+"""Skip every python file containing nothing but whitespace"""
+SKIP_EMPTY_INIT = "init"
+"""Only skip empty ``__init__.py`` files, other files are documented without being read"""
+SKIP_EMPTY_NONE = "none"
+"""Never skip empty python files, no python file is read during discovery"""
+
+SKIP_UNDOCUMENTED_NONE = "none"
+"""Every module has a page"""
+SKIP_UNDOCUMENTED_EMPTY = "empty"
+"""Skip modules with no docstring, no public definitions and no public names in ``__all__``"""
+SKIP_UNDOCUMENTED_PRIVATE = "private"
+"""Skip modules with no docstring and no public definitions, even if they re-export names in ``__all__``"""
+
+SEARCH_FULL = "full"
+"""Generated pages are indexed by the search plugin like any other page"""
+SEARCH_EXCLUDE = "exclude"
+"""Generated pages are left out of the search index"""
+SEARCH_COMPACT = "compact"
+"""Generated pages are left out of the search index, their modules and members are indexed by name instead"""
+
 
 class SourceConfig(base.Config):
     package_dir: Optional[str] = c.Optional(c.Dir(exists=True)) # type: ignore
@@ -11,7 +32,28 @@ class SourceConfig(base.Config):
     edit_uri_template: str = c.Optional(c.Type(str)) # type: ignore
     hide_namespace: str = c.Type(str, default="") # type: ignore
     nav_heading: List[str] = c.ListOfItems(c.Type(str), default=["Reference"]) # type: ignore
+    skip_empty: str = c.Choice((SKIP_EMPTY_ALL, SKIP_EMPTY_INIT, SKIP_EMPTY_NONE),
+                               default=SKIP_EMPTY_ALL) # type: ignore
+    respect_gitignore: bool = c.Type(bool, default=False) # type: ignore
+    skip_undocumented: str = c.Choice((SKIP_UNDOCUMENTED_NONE, SKIP_UNDOCUMENTED_EMPTY, SKIP_UNDOCUMENTED_PRIVATE),
+                                      default=SKIP_UNDOCUMENTED_NONE) # type: ignore
+    shard_index: int = c.Type(int, default=0) # type: ignore
+    shard_count: int = c.Type(int, default=1) # type: ignore
+    split_members: int = c.Type(int, default=0) # type: ignore
+    module_template: Optional[str] = c.Optional(c.File(exists=True)) # type: ignore
+    package_template: Optional[str] = c.Optional(c.File(exists=True)) # type: ignore
+    search: str = c.Choice((SEARCH_FULL, SEARCH_EXCLUDE, SEARCH_COMPACT), default=SEARCH_FULL) # type: ignore
 
 
 class GeneratePythonDocsConfig(base.Config):
     source_dirs: List[SourceConfig] = c.ListOfItems(c.SubConfig(SourceConfig)) # type: ignore
+    in_memory: bool = c.Type(bool, default=False) # type: ignore
+    max_workers: int = c.Type(int, default=1) # type: ignore
+    cache_dir: Optional[str] = c.Optional(c.Type(str)) # type: ignore
+    preload_modules: bool = c.Type(bool, default=False) # type: ignore
+    prerender_workers: int = c.Type(int, default=0) # type: ignore
+    collapse_nav: bool = c.Type(bool, default=False) # type: ignore
+    nav_index_file: str = c.Type(str, default="reference_nav.json") # type: ignore
+    symbol_index_file: str = c.Type(str, default="reference_symbols.json") # type: ignore
+    instrumentation: bool = c.Type(bool, default=False) # type: ignore
+    instrumentation_file: Optional[str] = c.Optional(c.Type(str)) # type: ignore
@@ -0,0 +1,405 @@
+import codecs
+import logging
+import os
+import re
+from fnmatch import translate
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from pathspec import GitIgnoreSpec
+
+from mkdocstrings_python_generator.config import SKIP_EMPTY_ALL, SKIP_EMPTY_INIT
+from mkdocstrings_python_generator.instrumentation import SourceStats
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+if TYPE_CHECKING:
+    from mkdocstrings_python_generator.manifest import DiscoveryManifest
+
+log = logging.getLogger(__name__)
+
+_EMPTY_CHECK_CHUNK_SIZE = 4096
+
+VCS_IGNORE_FILES = (".gitignore", ".ignore")
+"""Files read in each directory when ignoring files excluded from version control"""
+
+
+class IgnoreMatcher:
+    """
+    All ignore patterns compiled into one matcher.
+
+    Patterns without a ``/`` are matched against the name of each file or directory, exactly as ``fnmatch`` would.
+    Patterns containing a ``/`` are matched against the ``/`` separated path relative to the directory being searched:
+    ``*`` and ``?`` never match ``/`` and a ``**`` segment matches any number of directories.  A trailing ``/**`` also
+    matches the directory itself so ``build/**`` excludes the whole ``build`` directory.
+
+    Directories which match are never descended into.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        :param patterns: Glob patterns to ignore
+        """
+        name_patterns: List[str] = []
+        path_patterns: List[str] = []
+        for pattern in patterns:
+            if "/" in pattern:
+                path_patterns.append(_translate_path_pattern(pattern))
+            else:
+                name_patterns.append(translate(os.path.normcase(pattern)))
+        self._match_name = _compile_any(name_patterns)
+        self._match_path = _compile_any(path_patterns)
+
+    def __call__(self, name: str, relative_path: str) -> bool:
+        """
+        Test if a file or directory should be ignored
+        :param name: Name of the file or directory
+        :param relative_path: ``/`` separated path relative to the directory being searched
+        :return: True if it should be ignored
+        """
+        return self._match_name(os.path.normcase(name)) or self._match_path(relative_path)
+
+
+def _compile_any(patterns: List[str]) -> Callable[[str], bool]:
+    if not patterns:
+        return lambda value: False
+    regex = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    return lambda value: regex.fullmatch(value) is not None
+
+
+def _translate_path_pattern(pattern: str) -> str:
+    """
+    Translate a ``/`` separated glob into a regular expression
+    :param pattern: A glob pattern containing at least one ``/``
+    :return: Regular expression matching relative paths
+    """
+    segments = pattern.strip("/").split("/")
+    regex = ""
+    separator = ""
+    for position, segment in enumerate(segments):
+        if segment == "**":
+            if position == len(segments) - 1:
+                regex += "(?:/.*)?" if position else ".*"
+            else:
+                regex += separator + "(?:[^/]+/)*"
+                separator = ""
+            continue
+        regex += separator + _translate_segment(segment)
+        separator = "/"
+    return regex
+
+
+def _translate_segment(segment: str) -> str:
+    """
+    Translate a single path segment of a glob into a regular expression that can't match ``/``
+    """
+    result = []
+    position = 0
+    while position < len(segment):
+        char = segment[position]
+        position += 1
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[" and (end := segment.find("]", position + 1)) != -1:
+            char_class = segment[position:end]
+            position = end + 1
+            if char_class.startswith("!"):
+                char_class = "^/" + char_class[1:]
+            result.append("[" + char_class.replace("\\", "\\\\") + "]")
+        else:
+            result.append(re.escape(char))
+    return "".join(result)
+
+
+class _IgnoreFile(NamedTuple):
+    """Patterns read from one ignore file"""
+    strip: int
+    """Length of the prefix to remove from a path (relative to the search directory) for these patterns"""
+    prepend: str
+    """Prefix to add to a path (relative to the search directory) for these patterns"""
+    patterns: Sequence
+
+
+class VcsIgnore:
+    """
+    Rules read from ``.gitignore`` and ``.ignore`` files which apply to one directory of the search.
+
+    Files are parsed locally (git is never run) with the same semantics as git: patterns are relative to the directory
+    holding the ignore file, the last matching pattern wins and deeper files take priority over shallower ones.  When
+    the search starts inside a git work tree, ignore files from the parent directories up to the root of the work tree
+    and ``.git/info/exclude`` apply too.
+    """
+    _files: tuple[_IgnoreFile, ...]
+
+    def __init__(self, files: tuple[_IgnoreFile, ...] = ()):
+        self._files = files
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> "VcsIgnore":
+        """
+        Load the rules applying to the top of a search
+        :param directory: Directory where the search starts
+        :return: Rules for ``directory``
+        """
+        directory = Path(os.path.abspath(directory))
+        files: List[_IgnoreFile] = []
+        for work_tree in (directory, *directory.parents):
+            if (work_tree / ".git").exists():
+                break
+        else:
+            # Not a git work tree so only the search directory's own ignore files apply
+            work_tree = directory
+        for parent in reversed((directory, *directory.parents)[:len(directory.relative_to(work_tree).parts) + 1]):
+            prepend = "".join(part + "/" for part in directory.relative_to(parent).parts)
+            if parent == work_tree:
+                files.extend(_read_ignore_file(parent / ".git" / "info" / "exclude", 0, prepend))
+            for name in VCS_IGNORE_FILES:
+                files.extend(_read_ignore_file(parent / name, 0, prepend))
+        return cls(tuple(files))
+
+    def descend(self, directory: Union[str, Path], relative_dir: str, names: Iterable[str]) -> "VcsIgnore":
+        """
+        Get the rules for a subdirectory
+        :param directory: Path to the subdirectory
+        :param relative_dir: ``/`` terminated path of the subdirectory relative to the search directory
+        :param names: Names of everything in the subdirectory
+        :return: Rules for the subdirectory
+        """
+        present = {name for name in names if name in VCS_IGNORE_FILES}
+        if not present:
+            return self
+        files = [
+            ignore_file for name in VCS_IGNORE_FILES if name in present
+            for ignore_file in _read_ignore_file(Path(directory, name), len(relative_dir), "")
+        ]
+        return VcsIgnore(self._files + tuple(files))
+
+    def __call__(self, relative_path: str, is_dir: bool) -> bool:
+        """
+        Test if a file or directory is ignored
+        :param relative_path: ``/`` separated path relative to the search directory
+        :param is_dir: True if the path is a directory
+        :return: True if it is ignored
+        """
+        ignored = False
+        suffix = "/" if is_dir else ""
+        for ignore_file in self._files:
+            path = ignore_file.prepend + relative_path[ignore_file.strip:] + suffix
+            for pattern in ignore_file.patterns:
+                if pattern.include is not None and pattern.match_file(path) is not None:
+                    ignored = pattern.include
+        return ignored
+
+
+def _read_ignore_file(path: Path, strip: int, prepend: str) -> List[_IgnoreFile]:
+    try:
+        with open(path, encoding="utf8") as ignore_file:
+            patterns = GitIgnoreSpec.from_lines(ignore_file).patterns
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    log.debug("Using ignore file %s", path)
+    return [_IgnoreFile(strip, prepend, patterns)]
+
+
+def discover_python_files(base_dir: Path,
+                          source_dir: Path,
+                          ignore: Union[List[str], IgnoreMatcher],
+                          skip_empty: str = SKIP_EMPTY_ALL,
+                          respect_gitignore: bool = False,
+                          stats: Optional[SourceStats] = None,
+                          manifest: Optional["DiscoveryManifest"] = None,
+                          directory: Optional[Path] = None,
+                          vcs_ignore: Optional[VcsIgnore] = None) -> Iterable[ModuleRef]:
+    """
+    Discover Python files recursively from a directory
+
+    Implicitly skip any ignored files and any empty files. Therefore, this will implicitly skip __init__.py files only
+    if they are empty. __main__.py is always ignored.
+
+    Files and directories are visited in name order.  The type information ``os.scandir`` already has is used so no
+    file is stat'ed unless it has to be checked for being empty.
+
+    :param base_dir: Base path containing the package tree
+    :param source_dir: Directory to search
+    :param ignore: Glob patterns of files and directories to skip, see ``IgnoreMatcher``
+    :param skip_empty: Which empty files to skip, one of ``"all"``, ``"init"`` or ``"none"``
+    :param respect_gitignore: Also skip anything excluded by ``.gitignore`` or ``.ignore`` files, see ``VcsIgnore``.
+        The ``.git`` directory itself is skipped too.
+    :param stats: Stats to add the number of files scanned and skipped to
+    :param manifest: Reuse directory listings and empty file checks from a previous search where nothing changed.
+        Everything found is recorded in the manifest (but not saved).
+    :param directory: Only search this directory, finding what a search of all of ``source_dir`` would find there.
+        Nothing is found, and nothing is searched, if the directory is not inside ``source_dir`` or is itself ignored.
+    :param vcs_ignore: Rules for ``source_dir`` from ``VcsIgnore.for_directory``, to share between searches.  Loaded if
+        None and ``respect_gitignore`` is set.
+    """
+    is_ignored = ignore if isinstance(ignore, IgnoreMatcher) else IgnoreMatcher(ignore)
+    if not respect_gitignore:
+        vcs_ignore = None
+    elif vcs_ignore is None:
+        vcs_ignore = VcsIgnore.for_directory(source_dir)
+    start_dir: Union[str, Path] = source_dir
+    start_relative = ""
+    if directory is not None:
+        try:
+            parts = Path(directory).relative_to(source_dir).parts
+        except ValueError:
+            log.debug("Not searching %s outside %s", directory, source_dir)
+            return
+        if parts:
+            ignored, vcs_ignore = _check_path(source_dir, parts, True, is_ignored, vcs_ignore)
+            if ignored:
+                log.debug("Not searching ignored directory %s", directory)
+                return
+            start_dir = directory
+            start_relative = "/".join(parts) + "/"
+    # Module references are built from the relative path already to hand rather than resolving each file's path
+    prefix = Path(source_dir).relative_to(base_dir).parts
+    # Iterative depth first search: each level of the stack holds the remaining entries of one directory
+    stack: List[tuple[str, Iterator[os.DirEntry], Optional[VcsIgnore]]] = [
+        (start_relative,
+         iter(_scan_sorted(start_dir) if manifest is None else manifest.scan(start_dir, start_relative)),
+         vcs_ignore),
+    ]
+    # Counted locally, the search is hot enough for attribute access to show
+    scanned = skipped_ignored = skipped_empty = 0
+    try:
+        while stack:
+            relative_dir, entries, vcs_ignore = stack[-1]
+            for entry in entries:
+                scanned += 1
+                relative_path = relative_dir + entry.name
+                if is_ignored(entry.name, relative_path):
+                    skipped_ignored += 1
+                    continue
+
+                is_dir = entry.is_dir()
+                if vcs_ignore is not None and (entry.name == ".git" or vcs_ignore(relative_path, is_dir)):
+                    skipped_ignored += 1
+                    continue
+
+                if is_dir:
+                    if manifest is None:
+                        children = _scan_sorted(entry.path)
+                    else:
+                        children = manifest.scan(entry.path, relative_path + "/")
+                    if vcs_ignore is not None:
+                        vcs_ignore = vcs_ignore.descend(entry.path, relative_path + "/",
+                                                        (child.name for child in children))
+                    stack.append((relative_path + "/", iter(children), vcs_ignore))
+                    break
+
+                if os.path.splitext(entry.name)[1] == ".py" and entry.is_file():
+                    if _should_check_empty(entry.name, skip_empty) and (
+                            is_empty_file(entry.path) if manifest is None else manifest.is_empty(entry.path,
+                                                                                                  relative_path)):
+                        log.debug(f"Skipping empty file {entry.path} ")
+                        skipped_empty += 1
+                        continue
+                    yield ModuleRef.from_parts(base_dir, prefix + tuple(relative_path.split("/")))
+            else:
+                stack.pop()
+    finally:
+        if stats is not None:
+            stats.files_scanned += scanned
+            stats.files_skipped_ignored += skipped_ignored
+            stats.files_skipped_empty += skipped_empty
+
+
+def discover_python_file(base_dir: Path,
+                         source_dir: Path,
+                         file: Path,
+                         ignore: Union[List[str], IgnoreMatcher],
+                         skip_empty: str = SKIP_EMPTY_ALL,
+                         respect_gitignore: bool = False,
+                         vcs_ignore: Optional[VcsIgnore] = None) -> Optional[ModuleRef]:
+    """
+    Apply the rules of ``discover_python_files`` to a single file without searching the rest of the tree
+    :param base_dir: Base path containing the package tree
+    :param source_dir: Directory ``discover_python_files`` would search
+    :param file: The file to check
+    :param ignore: Glob patterns of files and directories to skip, see ``IgnoreMatcher``
+    :param skip_empty: Which empty files to skip, one of ``"all"``, ``"init"`` or ``"none"``
+    :param respect_gitignore: Also skip anything excluded by ``.gitignore`` or ``.ignore`` files
+    :param vcs_ignore: Rules for ``source_dir`` from ``VcsIgnore.for_directory``, to share between calls.  Loaded if
+        None and ``respect_gitignore`` is set.
+    :return: The module if ``discover_python_files`` would find it, otherwise None
+    """
+    try:
+        parts = file.relative_to(source_dir).parts
+    except ValueError:
+        return None
+    if not parts or os.path.splitext(parts[-1])[1] != ".py" or not file.is_file():
+        return None
+    is_ignored = ignore if isinstance(ignore, IgnoreMatcher) else IgnoreMatcher(ignore)
+    if not respect_gitignore:
+        vcs_ignore = None
+    elif vcs_ignore is None:
+        vcs_ignore = VcsIgnore.for_directory(source_dir)
+    if _check_path(source_dir, parts, False, is_ignored, vcs_ignore)[0]:
+        return None
+    if _should_check_empty(parts[-1], skip_empty) and is_empty_file(file):
+        return None
+    return ModuleRef(base_dir, file)
+
+
+def _check_path(source_dir: Path, parts: Sequence[str], is_dir: bool, is_ignored: IgnoreMatcher,
+                vcs_ignore: Optional[VcsIgnore]) -> tuple[bool, Optional[VcsIgnore]]:
+    """
+    Apply the rules of a search of ``source_dir`` to a path and each directory leading to it
+    :param source_dir: Directory ``discover_python_files`` would search
+    :param parts: The path relative to ``source_dir`` broken into parts
+    :param is_dir: True if the path is a directory
+    :param is_ignored: Ignore patterns
+    :param vcs_ignore: Rules for ``source_dir``, None to not respect ignore files
+    :return: True if the path is ignored, and the rules for the path if it is a directory or its parent if not
+    """
+    directory = Path(source_dir)
+    for position, name in enumerate(parts):
+        relative_path = "/".join(parts[:position + 1])
+        part_is_dir = is_dir or position < len(parts) - 1
+        if is_ignored(name, relative_path):
+            return True, vcs_ignore
+        if vcs_ignore is not None:
+            if name == ".git" or vcs_ignore(relative_path, part_is_dir):
+                return True, vcs_ignore
+            if part_is_dir:
+                directory = directory / name
+                vcs_ignore = vcs_ignore.descend(
+                    directory, relative_path + "/", (name for name in VCS_IGNORE_FILES if (directory / name).exists()))
+    return False, vcs_ignore
+
+
+def _scan_sorted(directory: Union[str, Path]) -> List[os.DirEntry]:
+    with os.scandir(directory) as entries:
+        return sorted(entries, key=lambda entry: entry.name)
+
+
+def _should_check_empty(file_name: str, skip_empty: str) -> bool:
+    return skip_empty == SKIP_EMPTY_ALL or (skip_empty == SKIP_EMPTY_INIT and file_name == "__init__.py")
+
+
+def is_empty_file(file: Union[str, Path], size: Optional[int] = None) -> bool:
+    """
+    Check if a file contains nothing but whitespace.
+
+    The file is not decoded, and reading stops at the first chunk containing anything other than whitespace, so the
+    cost is bounded no matter how large the file is.
+    :param file: Path to the file
+    :param size: Size of the file if already known, saves a call to ``stat``
+    :return: True if the file has no content other than whitespace (and a UTF-8 BOM)
+    """
+    if size is None:
+        size = os.stat(file).st_size
+    if size == 0:
+        return True
+    with open(file, "rb") as stream:
+        chunk = stream.read(_EMPTY_CHECK_CHUNK_SIZE)
+        if chunk.startswith(codecs.BOM_UTF8):
+            chunk = chunk[len(codecs.BOM_UTF8):]
+        while chunk:
+            if chunk.strip():
+                return False
+            chunk = stream.read(_EMPTY_CHECK_CHUNK_SIZE)
+    return True
@@ -0,0 +1,96 @@
+import dataclasses
+import logging
+import posixpath
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urljoin, urlsplit
+
+from mkdocs.config.base import Config
+
+from mkdocstrings_python_generator.config import SourceConfig
+from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef
+
+log = logging.getLogger(__name__)
+
+
+class EditUrlFormatter:
+    """
+    Formats the edit URL of a python source file.
+
+    This reproduces the way mkdocs formats the edit URL of a markdown page (``Page.edit_url``) with the python source
+    file standing in for the markdown file.  All configuration is resolved once when the formatter is created so
+    formatting each URL is only string manipulation.
+    """
+
+    def __init__(self, repo_url: Optional[str], edit_uri: Optional[str], edit_uri_template: Optional[str]):
+        """
+        :param repo_url: mkdocs ``repo_url``
+        :param edit_uri: mkdocs ``edit_uri``, ignored if ``edit_uri_template`` is set
+        :param edit_uri_template: mkdocs ``edit_uri_template``
+        """
+        if edit_uri and not edit_uri.endswith("/"):
+            edit_uri += "/"
+        self._edit_uri = edit_uri
+        self._edit_uri_template = edit_uri_template
+        self._enabled = bool(edit_uri or edit_uri_template)
+        self._repo_url = repo_url
+        # Ensure urljoin behavior is correct
+        self._repo_url_dir = "" if not repo_url or repo_url.endswith("/") else repo_url + "/"
+        self._warned = False
+
+    @classmethod
+    def from_config(cls, config: Config, source_config: SourceConfig) -> "EditUrlFormatter":
+        """
+        Create a formatter for one source directory
+        :param config: Whole mkdocs config
+        :param source_config: Source config whose ``edit_uri`` or ``edit_uri_template`` override mkdocs' own
+        :return: A formatter
+        """
+        edit_uri, edit_uri_template = config["edit_uri"], config["edit_uri_template"]
+        if source_config.edit_uri is not None or source_config.edit_uri_template is not None:
+            # These are supposed to be mutually exclusive, but it's possible the main mkdocs config specifies one
+            # and the mkdocstings-python-generator specifies the other.
+            edit_uri, edit_uri_template = source_config.edit_uri, source_config.edit_uri_template
+        return cls(config["repo_url"], edit_uri, edit_uri_template)
+
+    def __call__(self, module_ref: ModuleRef) -> Optional[str]:
+        """
+        Format the edit URL for a module
+        :param module_ref: The module
+        :return: URL to edit the module's source file or None if edit URLs are not configured
+        """
+        if not self._enabled:
+            return None
+        # Path of the python source file relative to the base.  This should work on MS Windows
+        src_uri = "/".join(module_ref.parts)
+        if self._edit_uri_template:
+            file_edit_uri = self._edit_uri_template.format(path=src_uri, path_noext=posixpath.splitext(src_uri)[0])
+        else:
+            file_edit_uri = f"{self._edit_uri}{src_uri}"
+
+        if self._repo_url:
+            if file_edit_uri.startswith(("?", "#")):
+                return urljoin(self._repo_url, file_edit_uri)
+            return urljoin(self._repo_url_dir or self._repo_url, file_edit_uri)
+        self._warn_if_not_url(file_edit_uri)
+        return file_edit_uri
+
+    def _warn_if_not_url(self, file_edit_uri: str) -> None:
+        if self._warned:
+            return
+        self._warned = True
+        try:
+            parsed_url = urlsplit(file_edit_uri)
+            if not parsed_url.scheme or not parsed_url.netloc:
+                log.warning(f"edit_uri: {file_edit_uri!r} is not a valid URL, it should include the http:// (scheme)")
+        except ValueError as e:
+            log.warning(f"edit_uri: {file_edit_uri!r} is not a valid URL: {e}")
+
+    def resolve(self, file_refs: Iterable[GeneratedFileRef]) -> Iterator[GeneratedFileRef]:
+        """
+        Resolve the edit URL of many generated files in one batch
+        :param file_refs: Generated files
+        :return: The same generated files with ``edit_url`` set
+        """
+        for file_ref in file_refs:
+            edit_url = self(file_ref.module_ref)
+            yield file_ref if file_ref.edit_url == edit_url else dataclasses.replace(file_ref, edit_url=edit_url)
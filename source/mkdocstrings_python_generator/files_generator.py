@@ -1,88 +1,259 @@
+import dataclasses
 import logging
-from fnmatch import fnmatch
-from pathlib import Path
+import os
+from pathlib import Path, PurePosixPath
 from tempfile import TemporaryDirectory
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Sequence, Set
 
 from mkdocs.structure.files import File
 
 from mkdocstrings_python_generator.config import SourceConfig
+from mkdocstrings_python_generator.discovery import discover_python_files
+from mkdocstrings_python_generator.instrumentation import SourceStats
+from mkdocstrings_python_generator.manifest import DiscoveryManifest
 from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef
+from mkdocstrings_python_generator.templates import PageTemplate, page_context, render_page
 
 log = logging.getLogger(__name__)
 
+ModuleFilter = Callable[[Iterable[ModuleRef]], Iterable[ModuleRef]]
+
+
+class SplitModules(NamedTuple):
+    """How to split large modules into an overview page and a page for each member"""
+    members: Callable[[ModuleRef], Sequence[str]]
+    """Members of a module to give their own page, empty to keep the whole module on one page"""
+    overview_template: PageTemplate
+    """Template of the overview page, given ``member_links`` as well as the usual context"""
+    member_template: PageTemplate
+    """Template of each member page, given ``member_name`` as well as the usual context"""
+
+
+GENERATED_BY = "mkdocstrings-python-generator"
+"""Recorded as ``File.generated_by`` for pages held in memory"""
+
+
+class _CachedPage(NamedTuple):
+    """A page generated by a previous build, kept so that it can be reused by the next one"""
+    source_signature: Optional[tuple[int, int]]
+    """``(st_mtime_ns, st_size)`` of the python source file when the page was generated.  None for in memory pages."""
+    content: str
+    """Markdown content written to the page"""
+    file_ref: GeneratedFileRef
+    """Reference previously handed to mkdocs"""
+
 
 class FilesGenerator:
     """
     Generates files with all necessary metadata for mkdocs and populating nav elsewhere
+
+    Generated pages are cached between calls so that a long-lived generator (eg: during ``mkdocs serve``) only
+    writes pages for modules that are new or changed.  Unchanged modules reuse their previous ``File``.
+
+    With ``in_memory`` the pages are never written to disk at all, the ``File`` objects carry their own content.
     """
-    _temp_dir: TemporaryDirectory
+    _temp_dir: Optional[TemporaryDirectory]
+    base_path: Optional[Path]
+    _page_cache: Dict[tuple[ModuleRef, Optional[str]], _CachedPage]
 
-    def __init__(self, dest_dir: str, use_directory_urls: bool):
+    def __init__(self, dest_dir: str, use_directory_urls: bool, in_memory: bool = False):
         """
         :param dest_dir: Configured mkdocs destination directory
         :param use_directory_urls: Configured mkdocs use_directory_urls
+        :param in_memory: Keep generated pages in memory instead of writing them to a temporary directory.
+            This requires mkdocs 1.6 or later.
         """
-        self._temp_dir = TemporaryDirectory()
-        self.base_path = Path(self._temp_dir.name)
+        if in_memory:
+            self._temp_dir = None
+            self.base_path = None
+        else:
+            self._temp_dir = TemporaryDirectory()
+            self.base_path = Path(self._temp_dir.name)
 
         self._dest_dir = dest_dir
         self._use_directory_urls = use_directory_urls
+        self._page_cache = {}
+
+    @property
+    def in_memory(self) -> bool:
+        return self.base_path is None
+
+    def is_compatible(self, dest_dir: str, use_directory_urls: bool, in_memory: bool = False) -> bool:
+        """
+        Check if this generator's pages can be reused with a (possibly reloaded) mkdocs configuration
+        :param dest_dir: Configured mkdocs destination directory
+        :param use_directory_urls: Configured mkdocs use_directory_urls
+        :param in_memory: Whether generated pages should be kept in memory
+        """
+        return (self._dest_dir == dest_dir and self._use_directory_urls == use_directory_urls
+                and self.in_memory == in_memory)
 
     def cleanup(self) -> None:
         """
         Destroy all local resources including generated pages
         """
-        self._temp_dir.cleanup()
+        self._page_cache = {}
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
 
-    def generate_page(self, module_ref: ModuleRef, page_template: str) -> GeneratedFileRef:
+    def generate_page(self, module_ref: ModuleRef, page_template: PageTemplate, member: Optional[str] = None,
+                      split: bool = False, **template_args: str) -> GeneratedFileRef:
         """
         Generate a markdown page for a given source file.
 
-        Leave a reference for the page in self.generated_file
+        If the page was already generated with the same content and the python source file has not changed since
+        then, the previous ``GeneratedFileRef`` is returned and nothing is written.  The page is rewritten when the
+        source changes, even though its content may not, so that ``mkdocs serve --dirty`` sees it as modified.
 
         :param module_ref: Reference to a discovered Module
-        :param page_template: Python text template to generate the page
+        :param page_template: Template to generate the page, given ``page_context``
+        :param member: Generate a page for just this member of the module
+        :param split: The page is the overview of a module split into a page per member
+        :param template_args: Any more values to add to the template context
         :return: A ``FileEntry``
         """
-        log.debug("Processing %s", module_ref.module_path)
+        log.debug("Processing %s %s", module_ref, member or "")
+
+        content = render_page(page_template, page_context(module_ref, member, **template_args))
+        source_signature: Optional[tuple[int, int]] = None
+        if not self.in_memory:
+            # mkdocs always treats in memory pages as modified, so the source only needs checking for pages on disk
+            source_stat = os.stat(module_ref.module_path)
+            source_signature = (source_stat.st_mtime_ns, source_stat.st_size)
+        cached = self._page_cache.get((module_ref, member))
+        if cached is not None and cached.source_signature == source_signature and cached.content == content:
+            log.debug("Reusing %s", cached.file_ref.file.src_uri)
+            return cached.file_ref
+
+        src_uri = self.page_uri_for_module_id(module_ref, member)
+        if self.base_path is None:
+            entry = self._generate_memory_page(module_ref, src_uri, content)
+        else:
+            entry = self._generate_disk_page(module_ref, src_uri, content, self.base_path, cached)
+        if member is not None or split:
+            entry = dataclasses.replace(entry, member=member, split=split)
+        self._page_cache[(module_ref, member)] = _CachedPage(source_signature, content, entry)
+        return entry
+
+    def _generate_memory_page(self, module_ref: ModuleRef, src_uri: str, content: str) -> GeneratedFileRef:
+        log.debug("Generating %s in memory", src_uri)
+        file = File(src_uri, src_dir=None, dest_dir=self._dest_dir, use_directory_urls=self._use_directory_urls)
+        file.generated_by = GENERATED_BY
+        file.content_string = content
+        return GeneratedFileRef(module_ref=module_ref, doc_file_path=None, file=file)
 
-        target_path = self.file_path_for_module_id(module_ref)
+    def _generate_disk_page(self, module_ref: ModuleRef, src_uri: str, content: str, base_path: Path,
+                            cached: Optional[_CachedPage]) -> GeneratedFileRef:
+        target_path = base_path / src_uri
         log.debug("Generating %s", target_path)
         target_path.parent.mkdir(exist_ok=True, parents=True)
-        with open(target_path, "xt", encoding="utf8") as page:
-            page.write(
-                page_template.format(
-                    module_name=module_ref.module_name,
-                    printable_module_id=module_ref.printable_module_id,
-                    module_id=module_ref.module_id,
-                ))
-
-        entry = GeneratedFileRef(module_ref=module_ref,
-                                 doc_file_path=target_path,
-                                 file=File(
-                                     str(target_path.relative_to(self.base_path)),
-                                     src_dir=str(self.base_path),
-                                     dest_dir=self._dest_dir,
-                                     use_directory_urls=self._use_directory_urls,
-                                 ))
-        return entry
+        # Only overwrite pages this generator wrote for the same module, anything else is a collision
+        mode = "wt" if cached is not None and cached.file_ref.doc_file_path == target_path else "xt"
+        with open(target_path, mode, encoding="utf8") as page:
+            page.write(content)
+
+        return GeneratedFileRef(module_ref=module_ref,
+                                doc_file_path=target_path,
+                                file=File(
+                                    src_uri,
+                                    src_dir=str(base_path),
+                                    dest_dir=self._dest_dir,
+                                    use_directory_urls=self._use_directory_urls,
+                                ))
 
-    def generate_pages_recursive(self, source: SourceConfig, template: str) -> Iterable[GeneratedFileRef]:
+    def generate_pages_recursive(self, source: SourceConfig, template: PageTemplate,
+                                 stats: Optional[SourceStats] = None,
+                                 manifest: Optional[DiscoveryManifest] = None,
+                                 module_filter: Optional[ModuleFilter] = None,
+                                 split: Optional[SplitModules] = None,
+                                 package_template: Optional[PageTemplate] = None) -> Iterable[GeneratedFileRef]:
         """
         Generate pages recursively.
 
-        This will leave references in self.generated_file as well as returning them as a list
+        This will leave references in self.generated_file as well as returning them as a list.  Once exhausted, pages
+        generated by a previous call for modules which no longer exist are deleted.
 
         :param source: source to search through
         :param template: Template to use to generate markdown file
+        :param stats: Stats to add discovery counters and the number of pages generated and written to
+        :param manifest: Manifest of a previous search to speed up discovery, see ``DiscoveryManifest``
+        :param module_filter: Applied to the modules discovered to choose which have a page
+        :param split: How to split large modules, None to always give each module one page
+        :param package_template: Template for the ``__init__`` module of each package, ``template`` if None
         :return: List of files generated
         """
         base_path = Path(source.base)
         package_dir = Path(source.package_dir or source.base)
-        for module_ref in discover_python_files(base_path, package_dir, source.ignore):
-            entry = self.generate_page(module_ref=module_ref, page_template=template)
-            yield entry
+        module_refs = discover_python_files(base_path,
+                                            package_dir,
+                                            source.ignore,
+                                            skip_empty=source.skip_empty,
+                                            respect_gitignore=source.respect_gitignore,
+                                            stats=stats,
+                                            manifest=manifest)
+        if module_filter is not None:
+            module_refs = module_filter(module_refs)
+        return self.generate_pages(module_refs, template, stats, split, package_template)
+
+    def generate_pages(self, module_refs: Iterable[ModuleRef], template: PageTemplate,
+                       stats: Optional[SourceStats] = None,
+                       split: Optional[SplitModules] = None,
+                       package_template: Optional[PageTemplate] = None) -> Iterable[GeneratedFileRef]:
+        """
+        Generate pages for modules which are already known.
+
+        Once exhausted, pages generated by a previous call for any module not in ``module_refs`` are deleted.
+
+        :param module_refs: Every module of the source
+        :param template: Template to use to generate markdown file
+        :param stats: Stats to add the number of pages generated and written to
+        :param split: How to split large modules, None to always give each module one page
+        :param package_template: Template for the ``__init__`` module of each package, ``template`` if None
+        :return: List of files generated
+        """
+        generated: Set[tuple[ModuleRef, Optional[str]]] = set()
+        for module_ref in module_refs:
+            if split is None or not (members := split.members(module_ref)):
+                if package_template is not None and module_ref.ref_path[-1] == "__init__":
+                    yield self._generate_counted(generated, stats, module_ref, package_template)
+                else:
+                    yield self._generate_counted(generated, stats, module_ref, template)
+                continue
+            # The overview links to each member's page, which is always in the same directory
+            overview_uri = self.page_uri_for_module_id(module_ref)
+            member_links = "\n".join(
+                f"- [`{member}`]({PurePosixPath(self.page_uri_for_module_id(module_ref, member)).name})"
+                for member in members)
+            log.debug("Splitting %s into %d pages", overview_uri, len(members))
+            yield self._generate_counted(generated, stats, module_ref, split.overview_template, split=True,
+                                         member_links=member_links)
+            for member in members:
+                yield self._generate_counted(generated, stats, module_ref, split.member_template, member)
+        self._remove_stale_pages(generated)
+
+    def _generate_counted(self, generated: Set[tuple[ModuleRef, Optional[str]]], stats: Optional[SourceStats],
+                          module_ref: ModuleRef, template: PageTemplate, member: Optional[str] = None,
+                          split: bool = False,
+                          **template_args: str) -> GeneratedFileRef:
+        generated.add((module_ref, member))
+        cached = self._page_cache.get((module_ref, member))
+        entry = self.generate_page(module_ref, template, member, split, **template_args)
+        if stats is not None:
+            stats.pages_generated += 1
+            if cached is None or cached.file_ref is not entry:
+                stats.pages_written += 1
+        return entry
+
+    def _remove_stale_pages(self, keep: Set[tuple[ModuleRef, Optional[str]]]) -> None:
+        """
+        Delete cached pages for any module (and member) not in ``keep``
+        :param keep: Modules and members whose pages are still in use
+        """
+        for key in [key for key in self._page_cache if key not in keep]:
+            cached = self._page_cache.pop(key)
+            log.debug("Removing %s", cached.file_ref.file.src_uri)
+            if cached.file_ref.doc_file_path is not None:
+                cached.file_ref.doc_file_path.unlink(missing_ok=True)
 
     def file_path_for_module_id(self, module_id: ModuleRef) -> Path:
         """
@@ -90,31 +261,36 @@ class FilesGenerator:
         :param module_id: The module reference
         :return: An absolute path
         """
+        if self.base_path is None:
+            raise ValueError("Pages generated in memory have no file path")
+        return self.base_path / self.page_uri_for_module_id(module_id)
+
+    def page_url_for_module_id(self, module_ref: ModuleRef, member: Optional[str] = None) -> str:
+        """
+        Find the URL a module's page has, whether or not it was generated
+        :param module_ref: The module
+        :param member: Find the URL of this member's page instead, for a module split into many pages
+        :return: URL relative to the site root, just like ``File.url``
+        """
+        return File(self.page_uri_for_module_id(module_ref, member), src_dir="", dest_dir=self._dest_dir,
+                    use_directory_urls=self._use_directory_urls).url
+
+    @staticmethod
+    def page_uri_for_module_id(module_id: ModuleRef, member: Optional[str] = None) -> str:
+        """
+        Format the mkdocs src_uri of the .md file for a module
+        :param module_id: The module reference
+        :param member: Format the src_uri of this member's page instead, for a module split into many pages.  Member
+            pages sit beside the module's page as ``<module page>.<member>.md``
+        :return: A ``/`` separated path relative to the (virtual) docs directory
+        """
         ref_path = module_id.ref_path
         if ref_path[-1] == "__init__":
             ref_path = ref_path[:-1] + ("index.md", )
         elif ref_path[-1].startswith("index"):
             # Move this file to a different name to avoid collision and avoid accidentally making it a section index
             ref_path = ref_path[:-1] + (ref_path[-1] + "_", )
-        return Path(self.base_path, "_ref", *ref_path).with_suffix(".md")
-
-
-def discover_python_files(base_dir: Path, source_dir: Path, ignore: List[str]) -> Iterable[ModuleRef]:
-    """
-    Discover Python files recursively from a directory
-
-    Implicitly skip any ignored files and any empty files. Therefore, this will implicitly skip __init__.py files only
-    if they are empty. __main__.py is always ignored.
-    """
-    for file in sorted(dir for dir in source_dir.iterdir()):
-        if any(fnmatch(file.name, pattern) for pattern in ignore):
-            continue
-
-        if file.is_dir():
-            yield from discover_python_files(base_dir, file, ignore)
-
-        elif file.is_file() and file.suffix == ".py":
-            if not file.read_text().strip():
-                log.debug(f"Skipping empty file {str(file)} ")
-                continue
-            yield ModuleRef(base_dir, file)
+        src_uri = str(PurePosixPath("_ref", *ref_path).with_suffix(".md"))
+        if member is not None:
+            src_uri = f"{src_uri[:-len('.md')]}.{member}.md"
+        return src_uri
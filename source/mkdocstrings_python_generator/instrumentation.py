@@ -0,0 +1,65 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceStats:
+    """Timings and counters for one source directory during one build"""
+    base: str
+    """Base directory of the source"""
+    package_dir: Optional[str]
+    """Package directory of the source"""
+    files_scanned: int = 0
+    """Files and directories examined during discovery"""
+    files_skipped_ignored: int = 0
+    """Files and directories skipped by ignore patterns or ``.gitignore``"""
+    files_skipped_empty: int = 0
+    """Python files skipped for being empty"""
+    modules_skipped_undocumented: int = 0
+    """Modules skipped for having nothing to document, see ``SourceConfig.skip_undocumented``"""
+    pages_generated: int = 0
+    """Pages handed to mkdocs"""
+    pages_written: int = 0
+    """Pages which had to be written rather than reused from a previous build"""
+    nav_sections_created: int = 0
+    """Sections added to the nav"""
+    timings: Dict[str, float] = field(default_factory=dict)
+    """Total wall time in seconds spent in each plugin hook"""
+
+    @contextmanager
+    def timer(self, hook: str) -> Iterator[None]:
+        """
+        Add the wall time of the enclosed code to the total for a hook
+        :param hook: Name of the hook
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[hook] = self.timings.get(hook, 0.0) + time.perf_counter() - start
+
+
+def report(stats: List[SourceStats], json_path: Optional[Path]) -> None:
+    """
+    Emit a summary of stats to the debug log and optionally a JSON file
+    :param stats: Stats of each source directory
+    :param json_path: File to write the stats to as JSON, None to only log them
+    """
+    for source_stats in stats:
+        timings = ", ".join(f"{hook} {seconds:.3f}s" for hook, seconds in source_stats.timings.items())
+        log.debug(
+            f"{source_stats.package_dir or source_stats.base}: {timings}; {source_stats.files_scanned} files scanned, "
+            f"{source_stats.files_skipped_ignored} ignored, {source_stats.files_skipped_empty} empty, "
+            f"{source_stats.modules_skipped_undocumented} undocumented, "
+            f"{source_stats.pages_generated} pages generated ({source_stats.pages_written} written), "
+            f"{source_stats.nav_sections_created} nav sections created")
+    if json_path is not None:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps({"sources": [asdict(source_stats) for source_stats in stats]}, indent=2))
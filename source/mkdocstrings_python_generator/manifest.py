@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from mkdocstrings_python_generator.discovery import is_empty_file
+
+log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+"""Version of the manifest format, manifests with any other version are discarded"""
+
+_RACY_NS = 2_000_000_000
+"""Anything modified this close to the time it was recorded may change again without its mtime changing"""
+
+_DIRECTORY = "d"
+_FILE = "f"
+_OTHER = "o"
+
+
+class _ManifestEntry:
+    """Stands in for ``os.DirEntry`` when a directory listing comes from the manifest"""
+    __slots__ = ("name", "path", "_kind")
+
+    def __init__(self, directory: str, name: str, kind: str):
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self._kind = kind
+
+    def is_dir(self) -> bool:
+        return self._kind == _DIRECTORY
+
+    def is_file(self) -> bool:
+        return self._kind == _FILE
+
+
+class DiscoveryManifest:
+    """
+    Directory listings and empty file checks from a previous search of one source directory.
+
+    A directory is listed again only if its mtime changed and a file is checked for being empty again only if its
+    mtime or size changed.  Every directory is still stat'ed: a change deep in the tree does not change the mtime of
+    the directories above it.
+
+    Entries are keyed by path relative to the source directory so a manifest stays valid if the whole tree moves, eg:
+    restored from a CI cache into a different workspace.  Note that a fresh checkout gives every file and directory a
+    new mtime, so the manifest only helps when the tree itself is restored or kept between builds.
+    """
+
+    def __init__(self, path: Path, recorded_ns: int = 0, directories: Optional[Dict[str, list]] = None,
+                 files: Optional[Dict[str, list]] = None):
+        """
+        :param path: File the manifest is saved to
+        :param recorded_ns: Time the previous search started
+        :param directories: Recorded ``[mtime_ns, names, kinds]`` by ``/`` terminated relative directory
+        :param files: Recorded ``[mtime_ns, size, empty]`` by relative file path
+        """
+        self._path = path
+        self._old_recorded_ns = recorded_ns
+        self._old_directories = directories or {}
+        self._old_files = files or {}
+        self._directories: Dict[str, list] = {}
+        self._files: Dict[str, list] = {}
+        self._now_ns = time.time_ns()
+        self.directories_reused = 0
+        self.files_reused = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "DiscoveryManifest":
+        """
+        Load a manifest, starting an empty one if it is missing, unreadable or from another version
+        :param path: File the manifest was saved to
+        :return: The manifest
+        """
+        try:
+            with open(path, encoding="utf8") as manifest_file:
+                content: Dict[str, Any] = json.load(manifest_file)
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            log.debug(f"Ignoring unreadable discovery manifest {path}: {e}")
+            return cls(path)
+        if not isinstance(content, dict) or content.get("version") != MANIFEST_VERSION:
+            log.debug(f"Ignoring discovery manifest {path} from another version")
+            return cls(path)
+        return cls(path, content.get("recorded_ns", 0), content.get("directories"), content.get("files"))
+
+    def save(self) -> None:
+        """
+        Write everything recorded by the latest search, replacing the file atomically
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        content = {
+            "version": MANIFEST_VERSION,
+            "recorded_ns": self._now_ns,
+            "directories": self._directories,
+            "files": self._files,
+        }
+        with tempfile.NamedTemporaryFile("wt", encoding="utf8", dir=self._path.parent, prefix=self._path.name,
+                                         suffix=".tmp", delete=False) as temp_file:
+            json.dump(content, temp_file, separators=(",", ":"))
+        os.replace(temp_file.name, self._path)
+        log.debug(f"Saved discovery manifest {self._path}: {self.directories_reused} of {len(self._directories)} "
+                  f"directories and {self.files_reused} of {len(self._files)} empty checks reused")
+
+    def scan(self, directory: Union[str, Path], relative_dir: str) -> List[Any]:
+        """
+        List a directory, sorted by name
+        :param directory: The directory
+        :param relative_dir: ``/`` terminated path of the directory relative to the source directory, empty for the
+            source directory itself
+        :return: ``os.DirEntry`` or equivalent for each entry
+        """
+        directory = os.fspath(directory)
+        mtime_ns = os.stat(directory).st_mtime_ns
+        recorded = self._old_directories.get(relative_dir)
+        if recorded is not None and recorded[0] == mtime_ns and not self._is_racy(mtime_ns):
+            self.directories_reused += 1
+            self._directories[relative_dir] = recorded
+            return [_ManifestEntry(directory, name, kind) for name, kind in zip(recorded[1], recorded[2])]
+
+        with os.scandir(directory) as scanner:
+            entries = sorted(scanner, key=lambda entry: entry.name)
+        kinds = "".join(_DIRECTORY if entry.is_dir() else _FILE if entry.is_file() else _OTHER for entry in entries)
+        self._directories[relative_dir] = [mtime_ns, [entry.name for entry in entries], kinds]
+        return entries
+
+    def is_empty(self, file: Union[str, Path], relative_path: str) -> bool:
+        """
+        Check if a file contains nothing but whitespace, see ``is_empty_file``
+        :param file: Path to the file
+        :param relative_path: ``/`` separated path of the file relative to the source directory
+        :return: True if the file has no content other than whitespace
+        """
+        stat = os.stat(file)
+        recorded = self._old_files.get(relative_path)
+        if (recorded is not None and recorded[0] == stat.st_mtime_ns and recorded[1] == stat.st_size
+                and not self._is_racy(stat.st_mtime_ns)):
+            self.files_reused += 1
+            self._files[relative_path] = recorded
+            return recorded[2]
+        empty = is_empty_file(file, stat.st_size)
+        self._files[relative_path] = [stat.st_mtime_ns, stat.st_size, empty]
+        return empty
+
+    def _is_racy(self, mtime_ns: int) -> bool:
+        # Anything modified around the time it was recorded might have changed again since, within the resolution of
+        # its mtime
+        return mtime_ns >= self._old_recorded_ns - _RACY_NS
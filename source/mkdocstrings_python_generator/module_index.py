@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from watchdog.events import (EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED,
+                             FileSystemEvent, FileSystemEventHandler)
+
+from mkdocstrings_python_generator.config import SourceConfig
+from mkdocstrings_python_generator.discovery import (VCS_IGNORE_FILES, IgnoreMatcher, VcsIgnore, discover_python_file,
+                                                     discover_python_files)
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+log = logging.getLogger(__name__)
+
+
+def _rules(source_config: SourceConfig) -> tuple:
+    """Everything in a source config which decides which modules are discovered"""
+    return (source_config.base, source_config.package_dir, tuple(source_config.ignore), source_config.skip_empty,
+            source_config.respect_gitignore)
+
+
+class ModuleIndex:
+    """
+    The modules of one source directory, kept up to date from file system events.
+
+    ``mkdocs serve`` rebuilds after every change.  Rather than searching the whole tree on each rebuild, events
+    recorded since the last build are applied to the modules found by the build before: only files and directories
+    named by an event are checked.  The tree is only searched again when the rules deciding which files are modules
+    change (the source config or, with ``respect_gitignore``, an ignore file).
+
+    Events arrive on the file system observer's thread, everything else happens on the build thread.
+    """
+
+    def __init__(self, source_config: SourceConfig, modules: Iterable[ModuleRef]):
+        """
+        :param source_config: Configuration of the source directory
+        :param modules: Modules found by searching the source directory with ``source_config``
+        """
+        self._lock = threading.Lock()
+        self._pending: List[FileSystemEvent] = []
+        self._closed = False
+        self._modules: Dict[Path, ModuleRef] = {}
+        self._rescan = False
+        self._vcs_ignore: Optional[VcsIgnore] = None
+        self._set_config(source_config)
+        self._modules = {module_ref.module_path: module_ref for module_ref in modules}
+
+    def _set_config(self, source_config: SourceConfig) -> None:
+        self._config = source_config
+        self._rules = _rules(source_config)
+        self._base_path = Path(source_config.base)
+        self._source_dir = Path(source_config.package_dir or source_config.base)
+        self._ignore = IgnoreMatcher(source_config.ignore)
+
+    @property
+    def watch_path(self) -> str:
+        """Directory to watch for events"""
+        return os.path.abspath(self._source_dir)
+
+    def update_config(self, source_config: SourceConfig) -> None:
+        """
+        Use the config of a new build, searching the tree again if it changes which files are modules
+        :param source_config: Configuration of the source directory
+        """
+        if _rules(source_config) != self._rules:
+            self._rescan = True
+        self._set_config(source_config)
+
+    def record(self, event: FileSystemEvent) -> None:
+        """
+        Record an event to apply on the next call to ``modules``.  Safe to call from any thread.
+        :param event: A file system event under ``watch_path``
+        """
+        if event.event_type not in (EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED):
+            return
+        with self._lock:
+            if not self._closed:
+                self._pending.append(event)
+
+    def close(self) -> None:
+        """Stop recording events, the index is no longer used"""
+        with self._lock:
+            self._closed = True
+            self._pending = []
+
+    def modules(self) -> List[ModuleRef]:
+        """
+        Apply all events recorded so far
+        :return: Every module in the same order as ``discover_python_files``
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        # Ignore files are read again for each batch of events, a change to one inside the tree searches it again
+        self._vcs_ignore = None
+        for event in pending:
+            self._apply(event)
+        if self._rescan:
+            log.debug("Searching %s again", self._source_dir)
+            self._rescan = False
+            self._modules = {module_ref.module_path: module_ref for module_ref in self._discover(self._source_dir)}
+        # Sorting path segments visits directories depth first in name order, just like discover_python_files
+        return sorted(self._modules.values(), key=lambda module_ref: module_ref.parts)
+
+    def _apply(self, event: FileSystemEvent) -> None:
+        if self._rescan:
+            return
+        if event.event_type == EVENT_TYPE_MOVED:
+            self._remove(self._path(event.src_path))
+            self._add(self._path(event.dest_path), event.is_directory)
+        elif event.event_type == EVENT_TYPE_DELETED:
+            self._remove(self._path(event.src_path))
+        elif event.event_type == EVENT_TYPE_CREATED:
+            self._add(self._path(event.src_path), event.is_directory)
+        elif not event.is_directory:
+            # Modifying a file can make it empty or no longer empty
+            self._add(self._path(event.src_path), False)
+
+    @staticmethod
+    def _path(path: bytes | str) -> Path:
+        return Path(os.fsdecode(path))
+
+    def _remove(self, path: Path) -> None:
+        if self._is_rule_file(path):
+            return
+        if self._modules.pop(path, None) is not None:
+            log.debug("Module removed %s", path)
+            return
+        # Could be a directory, delete events don't always say
+        for module_path in [module_path for module_path in self._modules if path in module_path.parents]:
+            log.debug("Module removed %s", module_path)
+            del self._modules[module_path]
+
+    def _add(self, path: Path, is_dir: bool) -> None:
+        if self._is_rule_file(path):
+            return
+        if is_dir:
+            if not path.is_dir():
+                # Gone again before the event was applied
+                return
+            # A directory moved into the tree arrives as one event, only this subtree needs searching
+            for found in self._discover(path):
+                self._modules[found.module_path] = found
+            return
+        module_ref = discover_python_file(self._base_path, self._source_dir, path, self._ignore,
+                                          skip_empty=self._config.skip_empty,
+                                          respect_gitignore=self._config.respect_gitignore,
+                                          vcs_ignore=self._load_vcs_ignore())
+        if module_ref is None:
+            self._modules.pop(path, None)
+        elif path not in self._modules:
+            log.debug("Module added %s", path)
+            self._modules[path] = module_ref
+
+    def _is_rule_file(self, path: Path) -> bool:
+        if self._config.respect_gitignore and path.name in VCS_IGNORE_FILES:
+            # Could change anything below it
+            self._rescan = True
+            return True
+        return False
+
+    def _load_vcs_ignore(self) -> Optional[VcsIgnore]:
+        if self._config.respect_gitignore and self._vcs_ignore is None:
+            self._vcs_ignore = VcsIgnore.for_directory(self._source_dir)
+        return self._vcs_ignore
+
+    def _discover(self, directory: Path) -> Iterable[ModuleRef]:
+        # Searching a directory moved into the tree applies the rules from the source directory, an ignored directory
+        # is not searched at all
+        return discover_python_files(self._base_path, self._source_dir, self._ignore,
+                                     skip_empty=self._config.skip_empty,
+                                     respect_gitignore=self._config.respect_gitignore,
+                                     directory=directory,
+                                     vcs_ignore=self._load_vcs_ignore())
+
+
+class ModuleIndexEventHandler(FileSystemEventHandler):
+    """Record events in a ``ModuleIndex``"""
+
+    def __init__(self, module_index: ModuleIndex):
+        """
+        :param module_index: Index to keep up to date
+        """
+        super().__init__()
+        self._module_index = module_index
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        self._module_index.record(event)
+
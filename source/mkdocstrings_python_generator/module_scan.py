@@ -0,0 +1,182 @@
+import ast
+import logging
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from mkdocstrings_python_generator.config import SKIP_UNDOCUMENTED_EMPTY, SKIP_UNDOCUMENTED_NONE
+from mkdocstrings_python_generator.instrumentation import SourceStats
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+log = logging.getLogger(__name__)
+
+
+class ModuleSummary(NamedTuple):
+    """What a module has to document, from a quick scan of its source"""
+    has_docstring: bool
+    """The module has a docstring"""
+    has_public_definitions: bool
+    """The module defines a public class, function or variable of its own"""
+    has_exports: bool
+    """The module lists public names in ``__all__`` (which may only be imported)"""
+    members: tuple[str, ...] = ()
+    """Public classes and functions defined at the top level of the module, in source order"""
+    summary: str = ""
+    """First line of the module's docstring"""
+    member_summaries: tuple[str, ...] = ()
+    """First line of the docstring of each of ``members``"""
+
+
+DOCUMENTED = ModuleSummary(True, True, True)
+"""Summary used for anything that can't be scanned, so that it is always documented"""
+
+
+def scan_module(path: str) -> ModuleSummary:
+    """
+    Scan a python source file for anything to document without importing it
+    :param path: Path to the python source file
+    :return: Summary of the module
+    """
+    try:
+        with open(path, "rb") as source:
+            tree = ast.parse(source.read(), filename=path)
+    except (SyntaxError, ValueError, OSError) as e:
+        # mkdocstrings will report the problem when it renders the page
+        log.debug(f"Could not scan {path}: {e}")
+        return DOCUMENTED
+
+    definitions: List[str] = []
+    exports: List[str] = []
+    members: Dict[str, str] = {}
+    _scan_body(tree.body, definitions, exports, members)
+    if exports and "__all__" not in exports:
+        # An explicit __all__ decides what is public
+        members = {name: summary for name, summary in members.items() if name in exports}
+    members = {name: summary for name, summary in members.items() if not name.startswith("_")}
+    docstring = ast.get_docstring(tree)
+    return ModuleSummary(
+        has_docstring=bool(docstring),
+        has_public_definitions=any(_is_public(name) for name in definitions),
+        has_exports=any(_is_public(name) for name in exports),
+        members=tuple(members),
+        summary=_first_line(docstring),
+        member_summaries=tuple(members.values()),
+    )
+
+
+def _first_line(docstring: Optional[str]) -> str:
+    return docstring.strip().split("\n", 1)[0].strip() if docstring else ""
+
+
+def _scan_body(body: Iterable[ast.stmt], definitions: List[str], exports: List[str], members: Dict[str, str]) -> None:
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions.append(node.name)
+            # The first definition of a name is kept, eg: over a fallback in ``except ImportError:``
+            members.setdefault(node.name, _first_line(ast.get_docstring(node)))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id == "__all__":
+                    if isinstance(node.value, (ast.List, ast.Tuple)):
+                        exports.extend(element.value for element in node.value.elts
+                                       if isinstance(element, ast.Constant) and isinstance(element.value, str))
+                    else:
+                        # Computed, assume it exports something
+                        exports.append("__all__")
+                elif isinstance(target, ast.Name):
+                    definitions.append(target.id)
+        elif isinstance(node, (ast.If, ast.Try)):
+            # Conditional definitions such as ``if TYPE_CHECKING:`` or ``try: ... except ImportError:``
+            _scan_body(node.body, definitions, exports, members)
+            _scan_body(node.orelse, definitions, exports, members)
+            if isinstance(node, ast.Try):
+                for handler in node.handlers:
+                    _scan_body(handler.body, definitions, exports, members)
+                _scan_body(node.finalbody, definitions, exports, members)
+
+
+def _is_public(name: str) -> bool:
+    return name == "__all__" or not name.startswith("_")
+
+
+def should_document(summary: ModuleSummary, policy: str) -> bool:
+    """
+    Decide if a module should have a page
+    :param summary: Summary of the module
+    :param policy: One of ``"none"``, ``"empty"`` or ``"private"``, see ``SourceConfig.skip_undocumented``
+    :return: True if the module should have a page
+    """
+    if policy == SKIP_UNDOCUMENTED_NONE or summary.has_docstring or summary.has_public_definitions:
+        return True
+    return policy == SKIP_UNDOCUMENTED_EMPTY and summary.has_exports
+
+
+class ModuleScanner:
+    """
+    Decides which modules have a page, remembering each module's summary until its source file changes
+    """
+
+    def __init__(self, policy: str):
+        """
+        :param policy: One of ``"none"``, ``"empty"`` or ``"private"``, see ``SourceConfig.skip_undocumented``
+        """
+        self.policy = policy
+        self._summaries: Dict[ModuleRef, tuple[int, int, ModuleSummary]] = {}
+
+    def summary(self, module_ref: ModuleRef) -> ModuleSummary:
+        """
+        Summarise a module, scanning it only if it changed since the last time
+        :param module_ref: The module
+        :return: Summary of the module
+        """
+        path = os.fspath(module_ref.module_path)
+        stat = os.stat(path)
+        cached = self._summaries.get(module_ref)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        summary = scan_module(path)
+        self._summaries[module_ref] = (stat.st_mtime_ns, stat.st_size, summary)
+        return summary
+
+    def filter(self, module_refs: Iterable[ModuleRef],
+               stats: Optional[SourceStats] = None) -> Iterator[ModuleRef]:
+        """
+        Filter out modules which should not have a page.  Once exhausted, summaries of modules not seen are forgotten.
+        :param module_refs: Every module of the source
+        :param stats: Stats to add the number of modules skipped to
+        :return: Modules which should have a page
+        """
+        if self.policy == SKIP_UNDOCUMENTED_NONE:
+            seen = set()
+            for module_ref in module_refs:
+                seen.add(module_ref)
+                yield module_ref
+            # Only split_members scans modules with this policy, forget any module that has gone
+            self._summaries = {module_ref: summary for module_ref, summary in self._summaries.items()
+                               if module_ref in seen}
+            return
+        summaries = {}
+        for module_ref in module_refs:
+            summary = self.summary(module_ref)
+            summaries[module_ref] = self._summaries[module_ref]
+            if should_document(summary, self.policy):
+                yield module_ref
+            else:
+                log.debug(f"Skipping undocumented module {module_ref.module_id}")
+                if stats is not None:
+                    stats.modules_skipped_undocumented += 1
+        self._summaries = summaries
+
+    def split_members(self, threshold: int) -> Callable[[ModuleRef], Sequence[str]]:
+        """
+        Choose the members of large modules to give their own page, see ``SplitModules.members``
+        :param threshold: Split modules with at least this many public top level classes and functions
+        :return: Members of a module to give their own page, empty for modules under the threshold
+        """
+        def members(module_ref: ModuleRef) -> Sequence[str]:
+            if module_ref.ref_path[-1] == "__init__":
+                # A package's page is its section index, the members of a package are usually its modules
+                return ()
+            module_members = self.summary(module_ref).members
+            return module_members if len(module_members) >= threshold else ()
+        return members
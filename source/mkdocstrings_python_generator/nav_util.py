@@ -4,9 +4,9 @@ from typing import Dict, Iterable, List, Optional, Sequence
 
 from mkdocs.exceptions import PluginError
 from mkdocs.structure import StructureItem
-from mkdocs.structure.nav import Navigation, Page, Section
+from mkdocs.structure.nav import Link, Navigation, Page, Section
 
-from mkdocstrings_python_generator.reference_data import GeneratedFileRef, PageRef
+from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef, PageRef
 
 log = logging.getLogger(__name__)
 
@@ -17,57 +17,157 @@ NavPath = Sequence[str]
 This is specified as a sequence of Nav Titles from the root to leaf item"""
 
 
+class NavSectionIndex:
+    """Index of the sections in a nav by their path.
+
+    Looking up a section, and the parent sections leading to it, is a dictionary lookup per path segment the first time
+    and a single dictionary lookup after that.  Sections are found, or created, the same way as ``get_nav_section``
+    so the index must be used for all changes to the sections it has seen.
+    """
+    _children: Dict[tuple[str, ...], List[StructureItem]]
+    """Children of each known section by path"""
+    _titles: Dict[tuple[str, ...], Dict[str, StructureItem]]
+    """First item with each title in each known section by path"""
+
+    def __init__(self, navigation: Navigation):
+        """
+        :param navigation: Whole site navigation
+        """
+        self._children = {(): navigation.items}
+        self._titles = {}
+        self.sections_created = 0
+        """Count of sections created through this index"""
+
+    def get_section(self, section_path: NavPath) -> List[StructureItem]:
+        """Create a section or return an existing one with the same and position in the nav.
+
+        :param section_path: list or tuple of strings listing the section titles in order
+        :return: The children of the section defined by section_path
+        """
+        section_path = tuple(section_path)
+        children = self._children.get(section_path)
+        if children is None:
+            parent_path = section_path[:-1]
+            parent_titles = self._get_titles(parent_path, self.get_section(parent_path))
+            section_title = section_path[-1]
+            section = parent_titles.get(section_title)
+            if section is None:
+                section = Section(title=section_title, children=[])
+                self._children[parent_path].append(section)
+                parent_titles[section_title] = section
+                self.sections_created += 1
+            elif not isinstance(section, Section):
+                raise PluginError(f"mkdocstings-python-generator failed to generate section named '{section_title}':"
+                                  f" Something already exists in the nav with this name and is not a Section but a "
+                                  f"{type(section).__name__}")
+            children = self._children[section_path] = section.children
+        return children
+
+    def add_item(self, section_path: NavPath, item: StructureItem) -> None:
+        """Append an item to a section, creating the section if necessary
+
+        :param section_path: list or tuple of strings listing the section titles in order
+        :param item: Page or other item to add
+        """
+        section_path = tuple(section_path)
+        section_children = self.get_section(section_path)
+        section_children.append(item)
+        if item.title is not None:
+            self._get_titles(section_path, section_children).setdefault(item.title, item)
+
+    def _get_titles(self, section_path: tuple[str, ...],
+                    section_children: List[StructureItem]) -> Dict[str, StructureItem]:
+        titles = self._titles.get(section_path)
+        if titles is None:
+            titles = self._titles[section_path] = {}
+            for item in section_children:
+                if item.title is not None:
+                    titles.setdefault(item.title, item)
+        return titles
+
+
 def get_nav_section(navigation: Navigation, section_path: NavPath) -> list[StructureItem]:
     """Create a section or return an existing one with the same and position in the nav.
 
+    When finding many sections, use a ``NavSectionIndex`` instead.
+
     :param navigation: List of children from the nav parent.
     :param section_path: list or tuple of strings listing the section titles in order
     :return: A section defined by section_path
     """
-    section_children: List[StructureItem] = navigation.items
-    for segment in section_path:
-        section_children = _set_default_section(section_children, segment)
-    return section_children
+    return NavSectionIndex(navigation).get_section(section_path)
 
 
-def _set_default_section(section_children: List[StructureItem], section_title: str) -> list[StructureItem]:
-    """Create a section or return an existing one with the same title.
+def nav_location(module_ref: ModuleRef, nav_path: tuple[str, ...], name_space: tuple[str, ...]) -> tuple[str, ...]:
+    """Find the path of the section in the nav where a module's page belongs
 
-    :param section_children: List of children from the nav parent.
-    :param section_title: The title of the new section
-    :return: A section defined by section_title
+    :param module_ref: The module
+    :param nav_path: Path of the section holding all generated pages
+    :param name_space: Module id prefix hidden from the nav
+    :return: Path of the section to add the page to
     """
-    for pos, section in enumerate(section_children):
-        if section.title == section_title:
-            if isinstance(section, Section):
-                return section.children
-            else:
-                raise PluginError(f"mkdocstings-python-generator failed to generate section named '{section_title}':"
-                                  f" Something already exists in the nav with this name and is not a Section but a "
-                                  f"{type(section).__name__}")
-
-    new_section = Section(title=section_title, children=[])
-    section_children.append(new_section)
-    return new_section.children
+    location = module_ref.ref_path[:-1]
+    if location[:len(name_space)] == name_space:
+        return nav_path + location[len(name_space):]
+    return nav_path + location
 
 
-def add_page_to_nav(navigation: Navigation, page_ref: PageRef, nav_path: tuple[str, ...], name_space: tuple[str, ...]) -> None:
+def add_page_to_nav(navigation: Navigation,
+                    page_ref: PageRef,
+                    nav_path: tuple[str, ...],
+                    name_space: tuple[str, ...],
+                    section_index: Optional[NavSectionIndex] = None) -> None:
     """Add a page into the nav replacing any existing element
     :param navigation: Navigation
     :param page_ref: Page reference including file and module information
     :param name_space: a sequence of strings identifying the relative place in the name to add the page.
         If the page is added for python module foo.bar then the module_id will be ``("foo", "bar")``.
         The page will be added to the nav as <nav_parent> -> "foo" -> "bar".
+    :param section_index: Index of sections in the nav, share one index when adding many pages
     :return: The added page.
     """
-    page_ref.page.title = page_ref.file.module_ref.module_name
-    location = page_ref.file.module_ref.ref_path[:-1]
-    if location[:len(name_space)] == name_space:
-        location = nav_path + location[len(name_space):]
-    else:
-        location = nav_path + location
-    section_children = get_nav_section(navigation, location)
-    section_children.append(page_ref.page)
+    if section_index is None:
+        section_index = NavSectionIndex(navigation)
+    path = page_nav_path(page_ref.file, nav_path, name_space)
+    page_ref.page.title = path[-1]
+    section_index.add_item(path[:-1], page_ref.page)
+
+
+def page_nav_path(file_ref: GeneratedFileRef, nav_path: tuple[str, ...],
+                  name_space: tuple[str, ...]) -> tuple[str, ...]:
+    """Find where a generated page belongs in the nav
+    :param file_ref: The generated page
+    :param nav_path: Path of the section holding all generated pages
+    :param name_space: Module id prefix hidden from the nav
+    :return: Path of the section to add the page to, followed by the page's title
+    """
+    location = nav_location(file_ref.module_ref, nav_path, name_space)
+    if file_ref.split or file_ref.member is not None:
+        # A module split into a page per member gets its own section, just like a package
+        location += (file_ref.module_ref.module_name, )
+    return location + (file_ref.member if file_ref.member is not None else file_ref.module_ref.module_name, )
+
+
+def add_link_to_nav(navigation: Navigation,
+                    module_ref: ModuleRef,
+                    url: str,
+                    nav_path: tuple[str, ...],
+                    name_space: tuple[str, ...],
+                    section_index: Optional[NavSectionIndex] = None) -> Link:
+    """Add a link to a module's page where the page itself would go in the nav, eg: for a page built elsewhere
+    :param navigation: Navigation
+    :param module_ref: The module
+    :param url: URL of the module's page
+    :param nav_path: Path of the section holding all generated pages
+    :param name_space: Module id prefix hidden from the nav
+    :param section_index: Index of sections in the nav, share one index when adding many links
+    :return: The added link.
+    """
+    if section_index is None:
+        section_index = NavSectionIndex(navigation)
+    link = Link(title=module_ref.module_name, url=url)
+    section_index.add_item(nav_location(module_ref, nav_path, name_space), link)
+    return link
 
 
 def patch_nav_refs(nav: Navigation) -> None:
@@ -84,6 +184,7 @@ def patch_nav_refs(nav: Navigation) -> None:
             item.previous_page = previous
             if previous is not None:
                 previous.next_page = item
+            previous = item
         elif isinstance(item, Section):
             children = item.children
             if children is not None:
@@ -95,23 +196,168 @@ def patch_nav_refs(nav: Navigation) -> None:
 
 
 def prune_generated_pages(nav_parent: List[StructureItem],
-                          generated_files: Dict[str, GeneratedFileRef]) -> Iterable[PageRef]:
+                          generated_files: Dict[str, GeneratedFileRef]) -> List[PageRef]:
     """
-    Find generated pages in the nav, remove them and yield them
+    Find generated pages in the nav, remove them and return them
 
-    Generated pages will be removed from both ``generated_file``, and from ``nav_parent`` or its children.
+    Generated pages will be removed from ``nav_parent`` or its children, as will any section left empty.  Each list of
+    children is rebuilt once rather than removing pages one at a time.
     :param nav_parent: The .children or .items list of NavItems
     :param generated_files: Dictionary of generated pages with absolute paths pointing to the FileEntry.
-    :return: Generator of page items, pages will be removed just before yielding them so will never exist in the nav
-        at the moment they are yielded
+    :return: List of page items, all already removed from the nav
     """
-    for child in list(nav_parent):
+    pruned: List[PageRef] = []
+    _prune_generated_pages(nav_parent, generated_files, pruned)
+    return pruned
+
+
+def _prune_generated_pages(nav_parent: List[StructureItem], generated_files: Dict[str, GeneratedFileRef],
+                           pruned: List[PageRef]) -> None:
+    kept: List[StructureItem] = []
+    for child in nav_parent:
         if isinstance(child, Page) and child.file is not None:
             generated_file = generated_files.get(child.file.src_path, None)
             if generated_file is not None:
-                nav_parent.remove(child)
-                yield PageRef(page=child, file=generated_file)
+                pruned.append(PageRef(page=child, file=generated_file))
+                continue
         elif isinstance(child, Section):
-            yield from prune_generated_pages(child.children, generated_files)
+            _prune_generated_pages(child.children, generated_files, pruned)
             if not (child.is_page or child.children):
-                nav_parent.remove(child)
+                continue
+        kept.append(child)
+    if len(kept) != len(nav_parent):
+        nav_parent[:] = kept
+
+
+class CollapsedNav:
+    """The generated reference kept out of the site nav.
+
+    Themes put the whole nav in every page, so a large reference makes every page of the site large.  Instead the site
+    nav gets a single link (a stub) for each ``nav_heading`` and each reference page is given a nav of its own holding
+    just its ancestors and siblings.  The reference is built with the same sections ``add_page_to_nav`` makes, so
+    breadcrumbs, previous and next pages work just as they would in the site nav.
+    """
+    _stubs: Dict[tuple[str, ...], tuple[Link, Section]]
+    """Stub in the site nav and the reference section it stands in for, by ``nav_heading``"""
+
+    def __init__(self, navigation: Navigation, reference: Navigation):
+        """
+        :param navigation: Whole site navigation, to add stubs to
+        :param reference: Navigation holding only generated pages, placed by ``add_page_to_nav``
+        """
+        self._navigation = navigation
+        self._reference = reference
+        self._stubs = {}
+        patch_nav_refs(reference)
+
+    @property
+    def reference(self) -> Navigation:
+        """Navigation holding only the generated pages"""
+        return self._reference
+
+    def add_stubs(self, nav_paths: Iterable[NavPath], section_index: NavSectionIndex) -> None:
+        """Link to the first page of each reference section from the site nav, in place of the section
+
+        A section inside another collapsed section needs no stub of its own.
+        :param nav_paths: Paths of the sections holding generated pages, none of them empty
+        :param section_index: Index of the site nav
+        """
+        for nav_path in sorted({tuple(nav_path) for nav_path in nav_paths}, key=len):
+            if any(nav_path[:len(stub_path)] == stub_path for stub_path in self._stubs):
+                continue
+            section = _find_section(self._reference.items, nav_path)
+            url = _first_url(section) if section is not None else None
+            if section is None or url is None:
+                # No pages in this section
+                continue
+            stub = Link(title=nav_path[-1], url=url)
+            section_index.add_item(nav_path[:-1], stub)
+            self._stubs[nav_path] = (stub, section)
+
+    def page_nav(self, page: Page) -> Optional[Navigation]:
+        """Make the nav for a reference page: the site nav with the page's stub replaced by the page's ancestors
+        and siblings.  Sections among the siblings are links to their first page.
+
+        :param page: Any page
+        :return: The nav to render the page with, None if the page is not in the reference
+        """
+        ancestors: List[Section] = list(reversed(page.ancestors))  # type: ignore
+        titles = tuple(ancestor.title for ancestor in ancestors)
+        for stub_path, (stub, section) in self._stubs.items():
+            depth = len(stub_path)
+            if titles[:depth] == stub_path and ancestors[depth - 1] is section:
+                break
+        else:
+            return None
+        siblings = [_collapse(child) for child in ancestors[-1].children]
+        local = _active_section(ancestors[-1].title, siblings)
+        for ancestor in reversed(ancestors[depth - 1:-1]):
+            local = _active_section(ancestor.title, [local])
+        return Navigation(_replace_item(self._navigation.items, stub_path[:-1], stub, local), self._navigation.pages)
+
+    def index(self) -> list:
+        """Compact index of the whole reference, for a script to navigate it
+
+        :return: A list of items, a page or link is ``[title, url]`` and a section is ``[title, [items]]``.  URLs are
+            relative to the site root.
+        """
+        return _index_items(self._reference.items)
+
+
+def _find_section(items: List[StructureItem], section_path: tuple[str, ...]) -> Optional[Section]:
+    section = None
+    for title in section_path:
+        item = next((item for item in items if item.title == title), None)
+        if not isinstance(item, Section):
+            return None
+        section = item
+        items = section.children
+    return section
+
+
+def _first_url(section: Section) -> Optional[str]:
+    for child in section.children:
+        if isinstance(child, (Page, Link)):
+            return child.url
+        if isinstance(child, Section) and (url := _first_url(child)) is not None:
+            return url
+    return None
+
+
+def _collapse(item: StructureItem) -> StructureItem:
+    if isinstance(item, Section):
+        url = _first_url(item)
+        if url is not None:
+            return Link(title=item.title, url=url)
+    return item
+
+
+def _active_section(title: str, children: List[StructureItem]) -> Section:
+    section = Section(title=title, children=children)
+    section.active = True
+    return section
+
+
+def _replace_item(items: List[StructureItem], section_path: tuple[str, ...], old: StructureItem,
+                  new: StructureItem) -> List[StructureItem]:
+    # Copy the sections leading to the item, never modify the site nav
+    if not section_path:
+        return [new if item is old else item for item in items]
+    replaced = []
+    found = False
+    for item in items:
+        if not found and isinstance(item, Section) and item.title == section_path[0]:
+            found = True
+            item = _active_section(item.title, _replace_item(item.children, section_path[1:], old, new))
+        replaced.append(item)
+    return replaced
+
+
+def _index_items(items: List[StructureItem]) -> list:
+    index: list = []
+    for item in items:
+        if isinstance(item, Section):
+            index.append([item.title, _index_items(item.children)])
+        elif isinstance(item, (Page, Link)):
+            index.append([item.title, item.url])
+    return index
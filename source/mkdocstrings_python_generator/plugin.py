@@ -1,16 +1,36 @@
+import hashlib
+import json
 import logging
-from typing import Dict, List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from mkdocs.config import Config
 from mkdocs.config.defaults import MkDocsConfig
-from mkdocs.plugins import BasePlugin
+from mkdocs.exceptions import PluginError
+from mkdocs.livereload import LiveReloadServer
+from mkdocs.plugins import BasePlugin, event_priority
 from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import Navigation, Page
+from mkdocs.utils import write_file
+from mkdocs.utils.templates import TemplateContext
 
 from mkdocstrings_python_generator import files_generator
-from mkdocstrings_python_generator.config import GeneratePythonDocsConfig, SourceConfig
-from mkdocstrings_python_generator.nav_util import add_page_to_nav, prune_generated_pages, patch_nav_refs
-from mkdocstrings_python_generator.reference_data import GeneratedFileRef
+from mkdocstrings_python_generator.config import SEARCH_COMPACT, SEARCH_FULL, GeneratePythonDocsConfig, SourceConfig
+from mkdocstrings_python_generator.edit_url import EditUrlFormatter
+from mkdocstrings_python_generator.instrumentation import SourceStats, report
+from mkdocstrings_python_generator.manifest import DiscoveryManifest
+from mkdocstrings_python_generator.module_index import ModuleIndex, ModuleIndexEventHandler
+from mkdocstrings_python_generator.module_scan import ModuleScanner
+from mkdocstrings_python_generator.nav_util import (CollapsedNav, NavSectionIndex, add_link_to_nav, add_page_to_nav,
+                                                    patch_nav_refs, prune_generated_pages)
+from mkdocstrings_python_generator.preload import ModulePreloader
+from mkdocstrings_python_generator.prerender import Prerenderer, in_worker
+from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef, PageRef
+from mkdocstrings_python_generator.sharding import split_shard
+from mkdocstrings_python_generator.symbol_index import module_symbols, replace_search_entries
+from mkdocstrings_python_generator.templates import PageTemplate, TemplateLoader
 
 log = logging.getLogger(__name__)
 
@@ -20,28 +40,173 @@ MODULE_PAGE = """# `{module_name}`
 ::: {module_id}
 """
 
+MODULE_OVERVIEW_PAGE = """# `{module_name}`
+`{printable_module_id}`
+
+::: {module_id}
+    options:
+      members: false
+
+{member_links}
+"""
+
+MODULE_MEMBER_PAGE = """# `{member_name}`
+`{printable_module_id}.{member_name}`
+
+::: {module_id}.{member_name}
+"""
+
+
+def split_modules(source_config: SourceConfig, module_scanner: ModuleScanner) -> Optional[files_generator.SplitModules]:
+    """
+    How to split the large modules of a source into a page per member
+    :param source_config: Configuration of the source directory
+    :param module_scanner: Scanner to count the members of each module with
+    :return: None if the source doesn't split modules
+    """
+    if source_config.split_members <= 0:
+        return None
+    return files_generator.SplitModules(
+        members=module_scanner.split_members(source_config.split_members),
+        overview_template=MODULE_OVERVIEW_PAGE,
+        member_template=MODULE_MEMBER_PAGE,
+    )
+
 
 class GeneratePythonDocsProcessor:
     _files_generator: files_generator.FilesGenerator
     _generated_files: Dict[str, GeneratedFileRef]
-    _namespace: tuple[str, ...] = ()
+    _namespace: tuple[str, ...]
     _config: SourceConfig
 
-    def __init__(self, source_config: SourceConfig, all_config: MkDocsConfig) -> None:
+    def __init__(self,
+                 source_config: SourceConfig,
+                 all_config: MkDocsConfig,
+                 in_memory: bool = False,
+                 manifest_path: Optional[Path] = None,
+                 template_loader: Optional[TemplateLoader] = None) -> None:
+        """
+        :param source_config: Configuration for this source directory
+        :param all_config: Whole mkdocs configuration
+        :param in_memory: Keep generated pages in memory instead of a temporary directory
+        :param manifest_path: File to keep a ``DiscoveryManifest`` in to speed up searching the source, None for no
+            manifest
+        :param template_loader: Loader to share compiled templates between sources and builds, a new one is created if
+            None
+        :raises PluginError: If a configured template can't be loaded
+        """
+        self._files_generator = self._new_files_generator(all_config, in_memory)
+        self._module_index: Optional[ModuleIndex] = None
+        self._module_scanner = ModuleScanner(source_config.skip_undocumented)
+        self.configure(source_config, all_config, in_memory, manifest_path, template_loader)
+
+    def configure(self,
+                  source_config: SourceConfig,
+                  all_config: MkDocsConfig,
+                  in_memory: bool = False,
+                  manifest_path: Optional[Path] = None,
+                  template_loader: Optional[TemplateLoader] = None) -> None:
+        """
+        Start a new build, keeping whatever the previous build left that is still valid for this configuration.
+
+        ``mkdocs serve`` keeps the same plugin, and so the same processors, for every rebuild.  Generated pages and
+        their temporary directory, the module index and module summaries are kept unless the configuration changes
+        something they depend on.  Everything else only lasts one build.
+        :param source_config: Configuration for this source directory
+        :param all_config: Whole mkdocs configuration
+        :param in_memory: Keep generated pages in memory instead of a temporary directory
+        :param manifest_path: File to keep a ``DiscoveryManifest`` in to speed up searching the source, None for no
+            manifest
+        :param template_loader: Loader to share compiled templates between sources and builds, a new one is created if
+            None
+        :raises PluginError: If a configured template can't be loaded
+        """
+        if not self._files_generator.is_compatible(all_config["site_dir"], all_config["use_directory_urls"], in_memory):
+            self._files_generator.cleanup()
+            self._files_generator = self._new_files_generator(all_config, in_memory)
+        if self._module_index is not None:
+            self._module_index.update_config(source_config)
+        if self._module_scanner.policy != source_config.skip_undocumented:
+            self._module_scanner = ModuleScanner(source_config.skip_undocumented)
         self._source_config = source_config
+        self._config = source_config
+        self._manifest_path = manifest_path
         self._generated_files = {}
-        self._files_generator = files_generator.FilesGenerator(
+        self._other_shards: List[ModuleRef] = []
+        self._namespace = tuple(source_config.hide_namespace.split(".")) if source_config.hide_namespace else ()
+        self._stats = SourceStats(base=source_config.base, package_dir=source_config.package_dir)
+        if template_loader is None:
+            template_loader = TemplateLoader()
+        self._module_template: PageTemplate = MODULE_PAGE
+        if source_config.module_template is not None:
+            self._module_template = template_loader.load(source_config.module_template)
+        self._package_template: Optional[PageTemplate] = None
+        if source_config.package_template is not None:
+            self._package_template = template_loader.load(source_config.package_template)
+        self._split = split_modules(source_config, self._module_scanner)
+
+    @staticmethod
+    def _new_files_generator(all_config: MkDocsConfig, in_memory: bool) -> files_generator.FilesGenerator:
+        return files_generator.FilesGenerator(
             dest_dir=all_config["site_dir"],
             use_directory_urls=all_config["use_directory_urls"],
+            in_memory=in_memory,
         )
-        if source_config.hide_namespace:
-            self._namespace = tuple(source_config.hide_namespace.split("."))
-        self._config = source_config
+
+    def index_modules(self) -> ModuleIndex:
+        """
+        Keep the modules of the source in an index instead of searching the source on every build, see ``ModuleIndex``
+        :return: The index, to record file system events in
+        """
+        if self._module_index is None:
+            self._module_index = ModuleIndex(self._config,
+                                             (file_ref.module_ref for file_ref in self._generated_files.values()))
+        return self._module_index
 
     def on_files(self, files: Files, config: Config) -> None:
-        # Generate all markdown files
+        self.register_files(files, config, self.generate_files(config))
+
+    def generate_files(self, config: Config) -> List[GeneratedFileRef]:
+        """
+        Discover modules and generate their pages without touching anything shared with other sources
+        :param config: Whole mkdocs config
+        :return: Generated files in discovery order, with edit URLs resolved
+        """
+        # Resolve the edit URL of every page in one go while mkdocs config is to hand
+        edit_url_formatter = EditUrlFormatter.from_config(config, self._config)
+        if self._module_index is not None:
+            return list(edit_url_formatter.resolve(self._files_generator.generate_pages(
+                self._module_filter(self._module_index.modules()), self._module_template, self._stats, self._split,
+                self._package_template)))
+        manifest = DiscoveryManifest.load(self._manifest_path) if self._manifest_path is not None else None
+        generated = list(edit_url_formatter.resolve(self._files_generator.generate_pages_recursive(
+            self._config, self._module_template, self._stats, manifest, self._module_filter, self._split,
+            self._package_template)))
+        if manifest is not None:
+            try:
+                manifest.save()
+            except OSError as e:
+                log.warning(f"Could not save discovery manifest {self._manifest_path}: {e}")
+        return generated
+
+    def _module_filter(self, module_refs: Iterable[ModuleRef]) -> Iterable[ModuleRef]:
+        module_refs = self._module_scanner.filter(module_refs, self._stats)
+        self._other_shards = []
+        if self._config.shard_count > 1:
+            # Pages of other shards are built elsewhere, they are only linked to from the nav
+            module_refs = split_shard(module_refs, self._config.shard_index, self._config.shard_count,
+                                      self._other_shards)
+        return module_refs
+
+    def register_files(self, files: Files, config: Config, file_refs: List[GeneratedFileRef]) -> None:
+        """
+        Add pages from ``generate_files`` to mkdocs
+        :param files: mkdocs files to add to
+        :param config: Whole mkdocs config
+        :param file_refs: Result of ``generate_files``
+        """
         temp_nav_entry = []
-        for file_ref in self._files_generator.generate_pages_recursive(self._config, template=MODULE_PAGE):
+        for file_ref in file_refs:
             self._generated_files[file_ref.file.src_path] = file_ref
             files.append(file_ref.file)
             # This is just a placeholder, don't worry about the title, as long as the src_path is right
@@ -54,77 +219,349 @@ class GeneratePythonDocsProcessor:
         # else:
         # ... Nav entries will be auto-generated.
 
+    def register_autorefs(self, autorefs: Any) -> None:
+        """
+        Tell autorefs the URL of every module's page before any page is rendered.
+
+        Otherwise autorefs only learns a module's URL once its page is rendered.  The URLs are registered as absolute
+        URLs, which autorefs only uses when no page registered the identifier itself, so whatever a page renders
+        still takes precedence.  Modules whose pages are built by other shards are registered too.
+        :param autorefs: The mkdocs-autorefs plugin
+        """
+        for file_ref in self._generated_files.values():
+            module_id = file_ref.module_ref.module_id
+            if file_ref.member is not None:
+                module_id = f"{module_id}.{file_ref.member}"
+            if module_id:
+                autorefs.register_url(module_id, f"{file_ref.file.url}#{module_id}")
+        for module_ref in self._other_shards:
+            if module_ref.module_id:
+                url = self._files_generator.page_url_for_module_id(module_ref)
+                autorefs.register_url(module_ref.module_id, f"{url}#{module_ref.module_id}")
+
     def on_pre_page(self, page: Page, *, config: MkDocsConfig) -> None:
         # The markdown file is about to be rendered, this is our oppertunity to set the edit URL so that the link
         # is correctly rendered in HTML.
         src_path = page.file.src_path
         if src_path is not None and (generated_file := self._generated_files.get(src_path, None)) is not None:
-            page.edit_url = self.make_edit_url(config, generated_file)
+            page.edit_url = generated_file.edit_url
+
+    def on_page_markdown(self, page: Page) -> None:
+        # Page meta is read from the markdown just before this, anything set earlier would be replaced
+        if self._config.search != SEARCH_FULL and page.file.src_path in self._generated_files:
+            search_meta = page.meta.get("search")
+            page.meta["search"] = {**(search_meta if isinstance(search_meta, dict) else {}), "exclude": True}
+
+    def module_symbols(self) -> List[Dict[str, Any]]:
+        """
+        Index the modules and members of the generated pages, see ``symbol_index.module_symbols``
+        :return: The index
+        """
+        return module_symbols(list(self._generated_files.values()), self._module_scanner)
 
     def on_nav(self, nav: Navigation) -> None:
+        self.place_pages(nav, self.prune_nav(nav), NavSectionIndex(nav))
+
+    def prune_nav(self, nav: Navigation) -> List[PageRef]:
         # nav items for generated files will almost certainly be in the wrong place...
         # Prune them all
-        pages = list(prune_generated_pages(nav.items, self._generated_files))
-        pages.sort(key=lambda page: page.file.module_ref.ref_path)
+        return prune_generated_pages(nav.items, self._generated_files)
+
+    def place_pages(self, nav: Navigation, pages: List[PageRef], section_index: NavSectionIndex) -> None:
+        items: List[Union[PageRef, ModuleRef]] = [*pages, *self._other_shards]
+        # Pages of a split module stay in the order they were generated, overview first
+        items.sort(key=lambda item: (item.file.module_ref.ref_path, item.file.member is not None)
+                   if isinstance(item, PageRef) else (item.ref_path, False))
+        nav_path = tuple(self._config.nav_heading)
+        sections_before = section_index.sections_created
+        for item in items:
+            if isinstance(item, PageRef):
+                add_page_to_nav(
+                    navigation=nav,
+                    page_ref=item,
+                    nav_path=nav_path,
+                    name_space=self._namespace,
+                    section_index=section_index,
+                )
+            else:
+                add_link_to_nav(
+                    navigation=nav,
+                    module_ref=item,
+                    url=self._files_generator.page_url_for_module_id(item),
+                    nav_path=nav_path,
+                    name_space=self._namespace,
+                    section_index=section_index,
+                )
+        self._stats.nav_sections_created += section_index.sections_created - sections_before
 
-        for page_ref in pages:
-            add_page_to_nav(
-                navigation=nav,
-                page_ref=page_ref,
-                nav_path=tuple(self._config.nav_heading),
-                name_space=self._namespace,
-            )
+    @property
+    def files_generator(self) -> files_generator.FilesGenerator:
+        return self._files_generator
+
+    @property
+    def module_scanner(self) -> ModuleScanner:
+        return self._module_scanner
+
+    @property
+    def module_index(self) -> Optional[ModuleIndex]:
+        return self._module_index
+
+    @property
+    def source_config(self) -> SourceConfig:
+        return self._config
+
+    @property
+    def generated_files(self) -> Dict[str, GeneratedFileRef]:
+        """Files generated by the latest call to ``on_files`` by ``src_path``"""
+        return self._generated_files
+
+    @property
+    def stats(self) -> SourceStats:
+        """Timings and counters of the current build"""
+        return self._stats
 
     def on_shutdown(self) -> None:
-        self._cleanup()
+        self.close()
 
-    def _cleanup(self):
+    def close(self) -> None:
+        """
+        Release everything held between builds: generated pages, their temporary directory and the module index
+        """
         self._files_generator.cleanup()
+        if self._module_index is not None:
+            self._module_index.close()
+            self._module_index = None
         self._generated_files = {}
+        self._other_shards = []
 
     def make_edit_url(self, config: MkDocsConfig, generated_file: GeneratedFileRef) -> str | None:
-        # Frustratingly, the mkdocs function to format the edit URL is wrapped up in the constructor of Page
-        # Parameters must be supplied through a Config object and a File object.
-
-        # Modify mkdocs config with overrides in this plugin's own configuration
-        temp_config = config.copy()
-        if self._config.edit_uri is not None or temp_config["edit_uri_template"] is not None:
-            # These are supposed to be mutually exclusive, but it's possible the main mkdocs config specifies one
-            # and the mkdocstings-python-generator specifies the other.
-            temp_config["edit_uri"] = self._config.edit_uri
-            temp_config["edit_uri_template"] = self._config.edit_uri_template
-
-        # Make a File object with the python source file as src_uri instead of the .md file
-        # This should work on MS Windows
-        path = "/".join(generated_file.module_ref.module_path.relative_to(generated_file.module_ref.base_path).parts)
-        temp_file = File(
-            path=path,
-            src_dir="",
-            dest_dir=temp_config["site_dir"],
-            use_directory_urls=temp_config["use_directory_urls"],
-        )
-        return Page("👻If you can see this something broke", temp_file, temp_config).edit_url
+        """
+        Format the edit URL for a single generated file
+
+        Pages built by ``on_files`` already have their edit URL resolved, this is only needed for anything else.
+        """
+        return EditUrlFormatter.from_config(config, self._config)(generated_file.module_ref)
+
+
+def _processor_key(position: int, source_config: SourceConfig) -> tuple:
+    """Identify which source a processor handled so it can be reused by the next build"""
+    return position, source_config.base, source_config.package_dir
+
+
+def _generate_files(processor: GeneratePythonDocsProcessor, config: Config) -> List[GeneratedFileRef]:
+    with processor.stats.timer("on_files"):
+        return processor.generate_files(config)
 
 
 class GeneratePythonDocs(BasePlugin[GeneratePythonDocsConfig]):
     _source_processors: List[GeneratePythonDocsProcessor]
+    _processors: Dict[tuple, GeneratePythonDocsProcessor]
+    _preloader: ModulePreloader
+    _prerenderer: Prerenderer
+    _template_loader: TemplateLoader
+    _mkdocs_config: Optional[MkDocsConfig]
+    _command: Optional[str]
+    _collapsed_nav: Optional[CollapsedNav]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._source_processors = []
+        self._processors = {}
+        self._preloader = ModulePreloader()
+        self._prerenderer = Prerenderer()
+        self._template_loader = TemplateLoader()
+        self._mkdocs_config = None
+        self._command = None
+        self._collapsed_nav = None
+
+    def on_startup(self, *, command: str, dirty: bool) -> None:
+        self._command = None if dirty else command
 
     def on_config(self, config: MkDocsConfig) -> None:
-        self._source_processors = [GeneratePythonDocsProcessor(c, config) for c in self.config.source_dirs]
+        if self.config.in_memory and not hasattr(File, "generated"):
+            raise PluginError("mkdocstrings-python-generator option in_memory requires mkdocs 1.6 or later")
+        if self.config.max_workers < 1:
+            raise PluginError("mkdocstrings-python-generator option max_workers must be at least 1")
+        if self.config.prerender_workers < 0:
+            raise PluginError("mkdocstrings-python-generator option prerender_workers must be 0 (disabled) or more")
+        if self.config.prerender_workers > 0 and not hasattr(File, "generated"):
+            raise PluginError("mkdocstrings-python-generator option prerender_workers requires mkdocs 1.6 or later")
+        for source_config in self.config.source_dirs:
+            if source_config.split_members < 0:
+                raise PluginError("mkdocstrings-python-generator option split_members must be 0 (never split) or more")
+            if self.config.collapse_nav and not source_config.nav_heading:
+                raise PluginError("mkdocstrings-python-generator option collapse_nav needs a nav_heading for every "
+                                  "source to name its entry in the nav")
+            if not 0 <= source_config.shard_index < source_config.shard_count:
+                raise PluginError(f"mkdocstrings-python-generator option shard_index must be from 0 to shard_count - 1"
+                                  f" ({source_config.shard_count - 1}), got {source_config.shard_index}")
+        self._mkdocs_config = config
 
-    def on_files(self, files: Files, config: Config, **kwargs) -> None:
+        # mkdocs keeps the same plugin instance for every rebuild of mkdocs serve.  Hand each source's processor on to
+        # the next build so that only new or changed modules have their pages rewritten.  Processors of sources no
+        # longer configured are closed straight away rather than left for the garbage collector.
+        previous = self._processors
+        self._processors = {}
+        self._source_processors = []
+        for position, source_config in enumerate(self.config.source_dirs):
+            key = _processor_key(position, source_config)
+            manifest_path = self._manifest_path(config, source_config)
+            processor = previous.pop(key, None)
+            if processor is None:
+                processor = GeneratePythonDocsProcessor(source_config, config, self.config.in_memory, manifest_path,
+                                                        self._template_loader)
+            else:
+                processor.configure(source_config, config, self.config.in_memory, manifest_path,
+                                    self._template_loader)
+            self._processors[key] = processor
+            self._source_processors.append(processor)
+        for processor in previous.values():
+            processor.close()
+
+    def _manifest_path(self, config: MkDocsConfig, source_config: SourceConfig) -> Optional[Path]:
+        if self.config.cache_dir is None:
+            return None
+        # Relative to mkdocs.yml, like every other path in the config.  The file is named after the source directory
+        # relative to mkdocs.yml so it is the same wherever the project is checked out.
+        config_dir = os.path.dirname(config.config_file_path or "")
+        source_dir = os.path.relpath(source_config.package_dir or source_config.base, config_dir or ".")
+        digest = hashlib.sha1(Path(source_dir).as_posix().encode("utf8")).hexdigest()[:16]
+        return Path(config_dir, self.config.cache_dir, f"discovery-{digest}.json")
+
+    def on_serve(self, server: LiveReloadServer, *, config: MkDocsConfig, builder) -> LiveReloadServer:
+        # Keep an index of each source's modules up to date from file system events so rebuilds don't search the tree.
+        # The first build has just searched it.
+        for processor in self._source_processors:
+            if processor.module_index is not None:
+                continue
+            module_index = processor.index_modules()
+            # watch() makes changes trigger a rebuild, the handler on the same observer records what changed
+            server.watch(module_index.watch_path)
+            server.observer.schedule(ModuleIndexEventHandler(module_index), module_index.watch_path, recursive=True)
+        return server
+
+    def on_files(self, files: Files, config: MkDocsConfig, **kwargs) -> None:
+        processors = self._source_processors
+        workers = min(self.config.max_workers, len(processors))
+        if workers > 1:
+            # Each source has its own generator and temporary directory so sources are independent until registered
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mkdocstrings-python-generator") as pool:
+                generated = list(pool.map(lambda processor: _generate_files(processor, config), processors))
+        else:
+            generated = [_generate_files(processor, config) for processor in processors]
+        # Registered serially in the order of source_dirs so files and nav are the same however they were generated
+        autorefs = config.plugins.get("autorefs")
+        for processor, file_refs in zip(processors, generated):
+            with processor.stats.timer("on_files"):
+                processor.register_files(files, config, file_refs)
+                if autorefs is not None:
+                    processor.register_autorefs(autorefs)
+        if self.config.preload_modules:
+            self._preloader.preload(config, (file_ref.module_ref for file_refs in generated for file_ref in file_refs))
+        # Only worth starting workers for a whole build, serve and dirty builds render few pages after the first
+        if self.config.prerender_workers > 0 and self._command in ("build", "gh-deploy") and not in_worker():
+            src_uris = [file_ref.file.src_uri for file_refs in generated for file_ref in file_refs]
+            self._prerenderer.start(config, src_uris, self.config.prerender_workers)
+
+    @event_priority(-100)  # Last, every other plugin's on_page_markdown has been run in the worker
+    def on_page_markdown(self, markdown: str, *, page: Page, config: MkDocsConfig, files: Files) -> str:
         for processor in self._source_processors:
-            processor.on_files(files, config)
+            with processor.stats.timer("on_page_markdown"):
+                processor.on_page_markdown(page)
+        if self._prerenderer.take(page):
+            # Nothing for mkdocs to render, the prerendered HTML is swapped in by on_page_content
+            return ""
+        return markdown
+
+    @event_priority(100)  # First, so that every other plugin's on_page_content sees the prerendered page
+    def on_page_content(self, html: str, *, page: Page, config: MkDocsConfig, files: Files) -> str:
+        return self._prerenderer.apply(html, page, config, files)
 
     def on_pre_page(self, page: Page, *, config: MkDocsConfig, files: Files) -> None:
         for processor in self._source_processors:
-            processor.on_pre_page(page, config=config)
+            with processor.stats.timer("on_pre_page"):
+                processor.on_pre_page(page, config=config)
 
     def on_nav(self, nav: Navigation, *, config: MkDocsConfig, files: Files) -> None:
+        # Prune every source's pages before indexing the nav, pruning can remove sections that become empty
+        pages = []
         for processor in self._source_processors:
-            processor.on_nav(nav)
+            with processor.stats.timer("on_nav"):
+                pages.append(processor.prune_nav(nav))
+        section_index = NavSectionIndex(nav)
+        self._collapsed_nav = None
+        if self.config.collapse_nav:
+            # Generated pages go in a nav of their own, the site nav just links to it
+            reference = Navigation([], [])
+            reference_index = NavSectionIndex(reference)
+            for processor, processor_pages in zip(self._source_processors, pages):
+                with processor.stats.timer("on_nav"):
+                    processor.place_pages(reference, processor_pages, reference_index)
+            self._collapsed_nav = CollapsedNav(nav, reference)
+            nav_headings = [processor.source_config.nav_heading for processor in self._source_processors]
+            self._collapsed_nav.add_stubs(nav_headings, section_index)
+        else:
+            for processor, processor_pages in zip(self._source_processors, pages):
+                with processor.stats.timer("on_nav"):
+                    processor.place_pages(nav, processor_pages, section_index)
         patch_nav_refs(nav)
 
+    def on_page_context(self, context: TemplateContext, *, page: Page, config: MkDocsConfig,
+                        nav: Navigation) -> TemplateContext:
+        if self._collapsed_nav is not None and (page_nav := self._collapsed_nav.page_nav(page)) is not None:
+            context["nav"] = page_nav
+        return context
+
+    @event_priority(50)  # Before the search plugin writes its index
+    def on_post_build(self, *, config: MkDocsConfig) -> None:
+        self._prerenderer.close()
+        if self._collapsed_nav is not None:
+            self._write_json(config, self.config.nav_index_file, self._collapsed_nav.index())
+        self._trim_search(config)
+        self._report(config)
+
+    def _trim_search(self, config: MkDocsConfig) -> None:
+        excluded_urls: set[str] = set()
+        symbols: List[Dict[str, Any]] = []
+        compact = False
+        for processor in self._source_processors:
+            if processor.source_config.search == SEARCH_FULL:
+                continue
+            excluded_urls.update(file_ref.file.url for file_ref in processor.generated_files.values())
+            if processor.source_config.search == SEARCH_COMPACT:
+                compact = True
+                symbols.extend(processor.module_symbols())
+        if excluded_urls:
+            replace_search_entries(config, excluded_urls, symbols)
+        if compact:
+            self._write_json(config, self.config.symbol_index_file, {"modules": symbols})
+
+    @staticmethod
+    def _write_json(config: MkDocsConfig, path: str, content: Any) -> None:
+        # Compact, these are written for scripts rather than people
+        encoded = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf8")
+        write_file(encoded, os.path.join(config.site_dir, path))
+
     def on_shutdown(self) -> None:
         for processor in self._source_processors:
-            processor.on_shutdown()
+            with processor.stats.timer("on_shutdown"):
+                processor.on_shutdown()
+        if self._source_processors:
+            # Reported again so that the time taken to clean up is included
+            self._report(self._mkdocs_config)
+        self._source_processors = []
+        self._processors = {}
+        self._preloader.clear()
+        self._prerenderer.close()
+        self._template_loader.clear()
+        self._mkdocs_config = None
+        self._collapsed_nav = None
+
+    def _report(self, config: Optional[MkDocsConfig]) -> None:
+        if not self.config.instrumentation or config is None:
+            return
+        json_path = None
+        if self.config.instrumentation_file is not None:
+            # Relative to mkdocs.yml, like every other path in the config
+            json_path = Path(os.path.dirname(config.config_file_path or ""), self.config.instrumentation_file)
+        report([processor.stats for processor in self._source_processors], json_path)
@@ -0,0 +1,99 @@
+import logging
+import os
+import time
+from typing import Any, Iterable, Optional
+
+from mkdocs.config.base import Config
+
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+log = logging.getLogger(__name__)
+
+
+class ModulePreloader:
+    """
+    Loads every top level package into the mkdocstrings python handler before any page is rendered.
+
+    The handler loads a whole top level package the first time any of its modules is rendered, then resolves aliases.
+    Loading them all up front keeps that work out of rendering, and lets the loaded packages be handed to the next
+    build of ``mkdocs serve`` when no module changed: mkdocstrings creates a new handler on every build, so otherwise
+    everything would be loaded again.
+    """
+
+    def __init__(self) -> None:
+        self._signature: Optional[tuple] = None
+        self._collections: Optional[tuple[Any, Any]] = None
+
+    def preload(self, config: Config, module_refs: Iterable[ModuleRef]) -> None:
+        """
+        Load the top level packages of modules into the python handler
+        :param config: Whole mkdocs config
+        :param module_refs: Every module that has a page
+        """
+        handler = _python_handler(config)
+        if handler is None:
+            return
+        module_refs = list(module_refs)
+        signature = (repr(_handler_config(config)), frozenset(_module_signature(module_ref)
+                                                              for module_ref in module_refs))
+        if signature == self._signature and self._collections is not None and _adopt(handler, self._collections):
+            log.debug("Reusing python modules loaded by the previous build")
+            return
+
+        options = handler.get_options({})
+        start = time.perf_counter()
+        # The griffe loader is not thread safe so packages are loaded one at a time
+        for package in sorted({module_ref.ref_path[0] for module_ref in module_refs if module_ref.module_id}):
+            try:
+                handler.collect(package, options)
+            except Exception as e:
+                # Rendering will report it with more context, preloading is only an optimisation
+                log.warning(f"Could not preload python package {package}: {e}")
+        log.debug(f"Preloaded python packages in {time.perf_counter() - start:.3f}s")
+        self._signature = signature
+        self._collections = _collections(handler)
+
+    def clear(self) -> None:
+        """Forget any loaded modules"""
+        self._signature = None
+        self._collections = None
+
+
+def _python_handler(config: Config) -> Any:
+    plugin = config["plugins"].get("mkdocstrings")
+    if plugin is None:
+        log.warning("mkdocstrings-python-generator option preload_modules has no effect without the mkdocstrings "
+                    "plugin")
+        return None
+    handler = plugin.get_handler("python")
+    if not hasattr(handler, "get_options"):
+        log.warning("mkdocstrings-python-generator option preload_modules is not supported by this version of "
+                    "mkdocstrings-python")
+        return None
+    return handler
+
+
+def _handler_config(config: Config) -> Any:
+    return config["plugins"]["mkdocstrings"].config.get("handlers", {}).get("python")
+
+
+def _module_signature(module_ref: ModuleRef) -> tuple:
+    stat = os.stat(module_ref.module_path)
+    return module_ref, stat.st_mtime_ns, stat.st_size
+
+
+# The handler has no public way to share what it has loaded, these are the attributes it keeps it in
+_COLLECTION_ATTRIBUTES = ("_modules_collection", "_lines_collection")
+
+
+def _collections(handler: Any) -> Optional[tuple[Any, Any]]:
+    if not all(hasattr(handler, attribute) for attribute in _COLLECTION_ATTRIBUTES):
+        return None
+    return handler._modules_collection, handler._lines_collection
+
+
+def _adopt(handler: Any, collections: tuple[Any, Any]) -> bool:
+    if _collections(handler) is None:
+        return False
+    handler._modules_collection, handler._lines_collection = collections
+    return True
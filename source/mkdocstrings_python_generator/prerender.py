@@ -0,0 +1,340 @@
+import logging
+import math
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import Files, get_files
+from mkdocs.structure.nav import get_navigation
+from mkdocs.structure.pages import Page
+
+log = logging.getLogger(__name__)
+
+_CHUNKS_PER_WORKER = 4
+"""Pages are handed to workers in chunks, several per worker so that workers finishing early can take more"""
+
+
+class PrerenderedPage(NamedTuple):
+    """Everything rendering a page produced in a worker, to be replayed when mkdocs renders the page"""
+    markdown: str
+    """Markdown after ``on_page_markdown`` events"""
+    content: str
+    """HTML before ``on_page_content`` events"""
+    toc: Any
+    """``Page.toc``"""
+    title: Optional[str]
+    """Title of the page found by rendering it"""
+    present_anchor_ids: Optional[set[str]]
+    """``Page.present_anchor_ids``"""
+    links_to_anchors: Dict[str, Dict[str, str]]
+    """``Page.links_to_anchors`` by the ``src_uri`` of the page linked to"""
+    anchors: List[tuple[str, Optional[str], Optional[str], bool, bool]]
+    """``(identifier, anchor, title, primary, early_alias)`` of each anchor registered with autorefs, see
+    ``early_alias`` of ``inventory``"""
+    urls: List[tuple[str, str]]
+    """``(identifier, url)`` of each URL registered with autorefs"""
+    inventory: List[tuple[Dict[str, Any], bool]]
+    """Arguments of each item registered in the mkdocstrings inventory and ``early_alias``: whether the name is an
+    alias the worker resolved ahead of time, which a serial build only knows once the alias's module is rendered"""
+    handlers: List[str]
+    """Names of the mkdocstrings handlers used so far"""
+    log_records: List[tuple[str, int, str]]
+    """``(logger name, level, message)`` of warnings and errors logged while rendering"""
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.records: List[tuple[str, int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.name, record.levelno, record.getMessage()))
+
+
+class _Worker:
+    """Builds the site up to its nav in a worker process, then renders the pages it is asked for"""
+
+    def __init__(self, config_file: str, options: Dict[str, Any]):
+        # Only in mkdocs 1.6 or later, which prerender_workers requires
+        from mkdocs.structure.files import set_exclusions
+
+        self.log_handler = _RecordingHandler()
+        logging.getLogger().addHandler(self.log_handler)
+        # Everything up to the nav is repeated from the main process, anything it logs has been logged there already
+        config = load_config(config_file, **options)
+        config.plugins.on_startup(command="build", dirty=False)
+        config = config.plugins.on_config(config)
+        config.plugins.on_pre_build(config=config)
+        files = get_files(config)
+        files.add_files_from_theme(config.theme.get_env(), config)
+        files = config.plugins.on_files(files, config=config)
+        set_exclusions(files, config)
+        nav = get_navigation(files, config)
+        config.plugins.on_nav(nav, config=config, files=files)
+        self.config = config
+        self.files = files
+        self.anchors: List[tuple[str, Optional[str], Optional[str], bool, bool]] = []
+        self.urls: List[tuple[str, str]] = []
+        self.inventory: List[tuple[Dict[str, Any], bool]] = []
+        self.handlers: Any = None
+        self.early_aliases: set[str] = set()
+        self._resolved_packages: set[str] = set()
+        self._record_registrations(config)
+        self.log_handler.records = []
+
+    def _record_registrations(self, config: MkDocsConfig) -> None:
+        # Wrap the registration methods of this process's autorefs and mkdocstrings instances to record what each
+        # page registers
+        autorefs = config.plugins.get("autorefs")
+        if autorefs is not None:
+            register_anchor = autorefs.register_anchor
+            register_url = autorefs.register_url
+
+            def record_anchor(page: Page, identifier: str, anchor: Optional[str] = None, *, title: Optional[str] = None,
+                              primary: bool = True) -> None:
+                self.anchors.append((identifier, anchor, title, primary, identifier in self.early_aliases))
+                register_anchor(page, identifier, anchor, title=title, primary=primary)
+
+            def record_url(identifier: str, url: str) -> None:
+                self.urls.append((identifier, url))
+                register_url(identifier, url)
+
+            autorefs.register_anchor = record_anchor
+            autorefs.register_url = record_url
+        mkdocstrings = config.plugins.get("mkdocstrings")
+        if mkdocstrings is not None:
+            self.handlers = mkdocstrings.handlers
+            inventory = self.handlers.inventory
+            register_item = inventory.register
+
+            def record_item(**kwargs: Any) -> None:
+                self.inventory.append((kwargs, kwargs["name"] in self.early_aliases))
+                register_item(**kwargs)
+
+            inventory.register = record_item
+            self._record_aliases(self.handlers.get_handler(mkdocstrings.config.default_handler))
+
+    def _record_aliases(self, handler: Any) -> None:
+        # A handler only knows an object's aliases once they have been resolved, which mostly happens when the module
+        # holding the alias is rendered.  A worker has not rendered every module before the ones it is given, so it
+        # resolves every alias ahead of time and marks those it would not otherwise know about.  The main process
+        # keeps them only if the alias's module was rendered before, just like a serial build.
+        get_aliases = getattr(handler, "get_aliases", None)
+        collection = getattr(handler, "_modules_collection", None)
+        if get_aliases is None or collection is None:
+            return
+
+        def resolve_aliases(obj: Any) -> None:
+            for member in list(obj.members.values()):
+                if member.is_alias:
+                    if member.resolved:
+                        continue
+                    try:
+                        member.resolve_target()
+                    except Exception:
+                        continue
+                    self.early_aliases.add(member.path)
+                elif member.is_module or member.is_class:
+                    resolve_aliases(member)
+
+        def record_aliases(identifier: str) -> tuple[str, ...]:
+            for package_name, package in list(collection.members.items()):
+                if package_name not in self._resolved_packages:
+                    self._resolved_packages.add(package_name)
+                    resolve_aliases(package)
+            return get_aliases(identifier)
+
+        handler.get_aliases = record_aliases
+
+    def render(self, src_uri: str) -> Optional[PrerenderedPage]:
+        """
+        Render a page just as ``mkdocs.commands.build`` would, up to but not including ``on_page_content`` events
+        :param src_uri: The page
+        :return: The result, None if the page could not be rendered
+        """
+        self.anchors, self.urls, self.inventory, self.log_handler.records = [], [], [], []
+        config, files = self.config, self.files
+        file = files.get_file_from_path(src_uri)
+        page = file.page if file is not None else None
+        if page is None:
+            return None
+        config._current_page = page
+        try:
+            page = config.plugins.on_pre_page(page, config=config, files=files)
+            page.read_source(config)
+            assert page.markdown is not None
+            page.markdown = config.plugins.on_page_markdown(page.markdown, page=page, config=config, files=files)
+            page.render(config, files)
+            assert page.content is not None
+        except Exception as e:
+            log.debug(f"Could not prerender {src_uri}: {e}")
+            return None
+        finally:
+            config._current_page = None
+        return PrerenderedPage(
+            markdown=page.markdown,
+            content=page.content,
+            toc=page.toc,
+            title=page._title_from_render,
+            present_anchor_ids=page.present_anchor_ids,
+            links_to_anchors={to_file.src_uri: links for to_file, links in (page.links_to_anchors or {}).items()},
+            anchors=self.anchors,
+            urls=self.urls,
+            inventory=self.inventory,
+            handlers=list(self.handlers._handlers) if self.handlers is not None else [],
+            log_records=self.log_handler.records,
+        )
+
+
+_worker: Optional[_Worker] = None
+_in_worker = False
+
+
+def in_worker() -> bool:
+    """
+    Check if this process is a prerender worker
+    :return: True in a worker, where pages must not be prerendered again
+    """
+    return _in_worker
+
+
+def _start_worker(config_file: str, options: Dict[str, Any]) -> None:
+    global _worker, _in_worker
+    _in_worker = True
+    _worker = _Worker(config_file, options)
+
+
+def _render_pages(src_uris: Sequence[str]) -> List[Optional[PrerenderedPage]]:
+    assert _worker is not None
+    return [_worker.render(src_uri) for src_uri in src_uris]
+
+
+class Prerenderer:
+    """
+    Renders pages in worker processes while mkdocs gets on with the rest of the build.
+
+    Each worker loads ``mkdocs.yml`` and runs plugin events up to ``on_nav`` itself, then renders pages just as mkdocs
+    would up to ``on_page_content``.  When mkdocs gets to a prerendered page, ``take`` swaps its markdown for nothing
+    so mkdocs' own rendering is trivial and ``apply`` swaps the prerendered HTML back in.  Anchors registered with
+    autorefs, mkdocstrings inventory items and warnings logged in the worker are replayed in the same order a serial
+    build would produce them.  A page which could not be prerendered is rendered by mkdocs as normal.
+    """
+
+    def __init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, tuple[Future, int]] = {}
+        self._ready: Dict[str, PrerenderedPage] = {}
+        self._rendered: set[str] = set()
+        self._failed = False
+
+    def start(self, config: MkDocsConfig, src_uris: Sequence[str], workers: int) -> None:
+        """
+        Start rendering pages
+        :param config: Whole mkdocs config
+        :param src_uris: Pages to render, in the order mkdocs will render them
+        :param workers: Number of worker processes
+        """
+        self.close()
+        if not src_uris:
+            return
+        if not config.config_file_path:
+            log.warning("mkdocstrings-python-generator can only prerender pages of a site with a mkdocs.yml")
+            return
+        # The main process may have overridden these on the command line
+        options = {"site_dir": config.site_dir, "docs_dir": config.docs_dir,
+                   "use_directory_urls": config.use_directory_urls}
+        # Spawned, not forked, so that workers don't inherit a half built site
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_start_worker, initargs=(config.config_file_path, options))
+        self._failed = False
+        chunk_size = math.ceil(len(src_uris) / (workers * _CHUNKS_PER_WORKER))
+        for start in range(0, len(src_uris), chunk_size):
+            chunk = src_uris[start:start + chunk_size]
+            future = self._pool.submit(_render_pages, chunk)
+            for position, src_uri in enumerate(chunk):
+                self._futures[src_uri] = (future, position)
+
+    def take(self, page: Page) -> bool:
+        """
+        Wait for a page to be prerendered
+        :param page: The page mkdocs is about to render
+        :return: True if the page was prerendered and must be given to ``apply``
+        """
+        future_position = self._futures.pop(page.file.src_uri, None)
+        if future_position is None or self._failed:
+            return False
+        future, position = future_position
+        try:
+            prerendered = future.result()[position]
+        except Exception as e:
+            # Most likely a worker failed to build the site, give up rather than wait for every other chunk to fail
+            log.warning(f"mkdocstrings-python-generator could not prerender pages, rendering them normally: {e}")
+            self._failed = True
+            return False
+        if prerendered is None:
+            return False
+        self._ready[page.file.src_uri] = prerendered
+        return True
+
+    def apply(self, html: str, page: Page, config: MkDocsConfig, files: Files) -> str:
+        """
+        Restore everything rendering a page taken by ``take`` would have done
+        :param html: HTML mkdocs rendered, which is empty for prerendered pages
+        :param page: The page
+        :param config: Whole mkdocs config
+        :param files: All files of the site
+        :return: The HTML to use
+        """
+        prerendered = self._ready.pop(page.file.src_uri, None)
+        if prerendered is None:
+            return html
+        for name, level, message in prerendered.log_records:
+            logging.getLogger(name).log(level, message)
+        page.markdown = prerendered.markdown
+        page.toc = prerendered.toc
+        page._title_from_render = prerendered.title
+        page.present_anchor_ids = prerendered.present_anchor_ids
+        links_to_anchors = {}
+        for src_uri, links in prerendered.links_to_anchors.items():
+            to_file = files.get_file_from_path(src_uri)
+            if to_file is not None:
+                links_to_anchors[to_file] = links
+        page.links_to_anchors = links_to_anchors
+        self._rendered.update(anchor[0] for anchor in prerendered.anchors if anchor[3])
+        autorefs = config.plugins.get("autorefs")
+        if autorefs is not None:
+            for identifier, anchor, title, primary, early_alias in prerendered.anchors:
+                if not early_alias or self._knows_alias(identifier):
+                    autorefs.register_anchor(page, identifier, anchor, title=title, primary=primary)
+            for identifier, url in prerendered.urls:
+                autorefs.register_url(identifier, url)
+        mkdocstrings = config.plugins.get("mkdocstrings")
+        if mkdocstrings is not None:
+            handlers = mkdocstrings.handlers
+            # mkdocstrings only writes the CSS and inventory of handlers it has used
+            for name in prerendered.handlers:
+                handlers.get_handler(name)
+            for item, early_alias in prerendered.inventory:
+                # mkdocstrings only registers aliases (priority 2) not already in the inventory, which the worker
+                # can't know
+                if item.get("priority") == 2 and item["name"] in handlers.inventory:
+                    continue
+                if not early_alias or self._knows_alias(item["name"]):
+                    handlers.inventory.register(**item)
+        return prerendered.content
+
+    def _knows_alias(self, alias: str) -> bool:
+        # Would a serial build have resolved the alias by now, by rendering the module (or class) holding it
+        return alias.rpartition(".")[0] in self._rendered
+
+    def close(self) -> None:
+        """Stop the workers and forget any page not yet taken"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._futures = {}
+        self._ready = {}
+        self._rendered = set()
+
@@ -1,8 +1,9 @@
 import logging
+import os
+import sys
 from dataclasses import dataclass
-from functools import cached_property
 from pathlib import Path
-from typing import NamedTuple
+from typing import Any, NamedTuple, Optional
 
 from mkdocs.structure.files import File
 from mkdocs.structure.nav import Page
@@ -10,50 +11,99 @@ from mkdocs.structure.nav import Page
 log = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
 class ModuleRef:
     """Module Reference
 
     The module ``foo.bar.baz`` will have id ``("foo", "bar", "baz")``
 
-    Module references are created by searching through source directories
+    Module references are created by searching through source directories.  Large trees have a great many of them so
+    they are slotted, share their base path, intern their path segments and work out their id and name once.  They are
+    immutable, compared and hashed by base path and path segments.
     """
+    __slots__ = ("base_path", "ref_path", "file_name", "module_id", "module_name", "_hash")
+
     base_path: Path
     """Base path containing this package tree"""
-    module_path: Path
-    """Fully qualified path inside the base path"""
+    ref_path: tuple[str, ...]
+    """Abstract representation of a python module broken into parts"""
+    file_name: str
+    """Name of the python source file"""
+    module_id: str
+    module_name: str
+    """Name of the module for internal reference only"""
+    _hash: int
+
+    def __init__(self, base_path: Path, module_path: Path):
+        """
+        :param base_path: Base path containing this package tree
+        :param module_path: Fully qualified path inside the base path
+        :raises ValueError: If ``module_path`` is not inside ``base_path``
+        """
+        self._set(base_path, module_path.relative_to(base_path).parts)
+
+    @classmethod
+    def from_parts(cls, base_path: Path, parts: tuple[str, ...]) -> "ModuleRef":
+        """
+        Create a reference without resolving any path, eg: for a file found by searching the base path
+        :param base_path: Base path containing this package tree
+        :param parts: Path of the python source file relative to ``base_path`` broken into parts
+        :return: A module reference
+        """
+        module_ref = cls.__new__(cls)
+        module_ref._set(base_path, parts)
+        return module_ref
+
+    def _set(self, base_path: Path, parts: tuple[str, ...]) -> None:
+        if not parts:
+            raise ValueError(f"{base_path} is not a python file")
+        file_name = sys.intern(parts[-1])
+        ref_path = tuple(sys.intern(part) for part in parts[:-1]) + (sys.intern(os.path.splitext(file_name)[0]), )
+        id_path = ref_path[:-1] if ref_path[-1] == "__init__" else ref_path
+        object.__setattr__(self, "base_path", base_path)
+        object.__setattr__(self, "ref_path", ref_path)
+        object.__setattr__(self, "file_name", file_name)
+        object.__setattr__(self, "module_id", ".".join(id_path))
+        # An __init__.py directly in the base path has an empty id and name
+        object.__setattr__(self, "module_name", id_path[-1] if id_path else "")
+        object.__setattr__(self, "_hash", hash((base_path, ref_path, file_name)))
 
-    def __post_init__(self):
-        # Validate that module_path is inside base_path
-        _ = self.ref_path
+    @property
+    def module_path(self) -> Path:
+        """Fully qualified path inside the base path, built on each access"""
+        return self.base_path.joinpath(*self.parts)
 
     @property
-    def module_id(self) -> str:
-        ref_path = self.ref_path
-        if ref_path[-1] == "__init__":
-            ref_path = ref_path[:-1]
-        return ".".join(ref_path)
+    def parts(self) -> tuple[str, ...]:
+        """Path of the python source file relative to the base path broken into parts"""
+        return self.ref_path[:-1] + (self.file_name, )
 
     @property
     def printable_module_id(self) -> str:
         """Printable module id
 
         This is the same as ``module_name`` except ``__init__`` is stripped."""
-        ref_path = self.ref_path
-        if ref_path[-1] == "__init__":
-            ref_path = ref_path[:-1]
-        return ".".join(ref_path)
+        return self.module_id
 
-    @property
-    def module_name(self) -> str:
-        """Name of the module for internal reference only"""
-        ref_path = self.ref_path
-        return ref_path[-1] if ref_path[-1] != "__init__" else ref_path[-2]
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ModuleRef):
+            return NotImplemented
+        return (self._hash == other._hash and self.ref_path == other.ref_path and self.file_name == other.file_name
+                and self.base_path == other.base_path)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(base_path={self.base_path!r}, module_path={self.module_path!r})"
 
-    @cached_property
-    def ref_path(self) -> tuple[str, ...]:
-        """Abstract representation of a python module broken into parts"""
-        return self.module_path.relative_to(self.base_path).with_suffix("").parts
+    def __reduce__(self):
+        return ModuleRef.from_parts, (self.base_path, self.parts)
 
 
 @dataclass(frozen=True)
@@ -63,10 +113,16 @@ class GeneratedFileRef:
     Stores information about markdown files generated by this plugin."""
     module_ref: ModuleRef
     """Representation of a python module"""
-    doc_file_path: Path
-    """Absolute path to markdown file on disk"""
+    doc_file_path: Optional[Path]
+    """Absolute path to markdown file on disk, None if the page is held in memory"""
     file: File
     """Mkdocs File object for use by mkdocs only"""
+    edit_url: Optional[str] = None
+    """URL to edit the python source file, set once mkdocs configuration is known"""
+    member: Optional[str] = None
+    """Member of the module documented by this page, None if it documents the module"""
+    split: bool = False
+    """This page is the overview of a module split into a page per member"""
 
 
 class PageRef(NamedTuple):
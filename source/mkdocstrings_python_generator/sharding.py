@@ -0,0 +1,34 @@
+import zlib
+from typing import Iterable, Iterator, List
+
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+
+def shard_of(module_id: str, shard_count: int) -> int:
+    """
+    Find which shard documents a module
+
+    This is stable across machines, processes and python versions (unlike ``hash``) so that every shard of a build
+    agrees on where each module belongs.
+    :param module_id: Id of the module
+    :param shard_count: Number of shards
+    :return: Index of the shard, from 0 to ``shard_count - 1``
+    """
+    return zlib.crc32(module_id.encode("utf8")) % shard_count
+
+
+def split_shard(module_refs: Iterable[ModuleRef], shard_index: int, shard_count: int,
+                other_shards: List[ModuleRef]) -> Iterator[ModuleRef]:
+    """
+    Pick out the modules of one shard
+    :param module_refs: Every module
+    :param shard_index: Index of the shard to pick
+    :param shard_count: Number of shards
+    :param other_shards: List to add every module belonging to other shards to
+    :return: Modules belonging to the shard
+    """
+    for module_ref in module_refs:
+        if shard_of(module_ref.module_id, shard_count) == shard_index:
+            yield module_ref
+        else:
+            other_shards.append(module_ref)
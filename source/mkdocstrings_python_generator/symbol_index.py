@@ -0,0 +1,62 @@
+import logging
+from typing import Any, Collection, Dict, List
+
+from mkdocs.config.defaults import MkDocsConfig
+
+from mkdocstrings_python_generator.module_scan import ModuleScanner
+from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef
+
+log = logging.getLogger(__name__)
+
+
+def module_symbols(file_refs: Collection[GeneratedFileRef], module_scanner: ModuleScanner) -> List[Dict[str, Any]]:
+    """
+    Index the modules of generated pages with their public classes and functions.
+
+    Everything comes from a scan of each module's source, not from its rendered page.
+    :param file_refs: Generated pages, the member pages of split modules are linked to from their module
+    :param module_scanner: Scanner to summarise each module with
+    :return: ``[{"id", "name", "summary", "url", "members": [{"id", "name", "summary", "url"}]}]`` ordered by module,
+        ``summary`` is the first line of the docstring
+    """
+    member_urls: Dict[tuple[ModuleRef, str], str] = {
+        (file_ref.module_ref, file_ref.member): file_ref.file.url
+        for file_ref in file_refs if file_ref.member is not None
+    }
+    modules = []
+    for file_ref in sorted(file_refs, key=lambda file_ref: file_ref.module_ref.ref_path):
+        if file_ref.member is not None:
+            continue
+        module_ref = file_ref.module_ref
+        summary = module_scanner.summary(module_ref)
+        members = []
+        for name, member_summary in zip(summary.members, summary.member_summaries):
+            member_id = f"{module_ref.module_id}.{name}" if module_ref.module_id else name
+            url = member_urls.get((module_ref, name), file_ref.file.url)
+            members.append({"id": member_id, "name": name, "summary": member_summary, "url": f"{url}#{member_id}"})
+        modules.append({"id": module_ref.module_id, "name": module_ref.module_name, "summary": summary.summary,
+                        "url": file_ref.file.url, "members": members})
+    return modules
+
+
+def replace_search_entries(config: MkDocsConfig, excluded_urls: Collection[str],
+                           modules: List[Dict[str, Any]]) -> None:
+    """
+    Remove pages from the index of mkdocs' built in search plugin, adding an entry for each module and member instead.
+
+    The built in search plugin ignores ``search: exclude`` in page meta, which other search plugins (eg:
+    mkdocs-material's) use.  This must be called before the search plugin writes its index in ``on_post_build``.
+    :param config: Whole mkdocs config
+    :param excluded_urls: URLs of the pages to remove
+    :param modules: Result of ``module_symbols``
+    """
+    search_index = getattr(config.plugins.get("search"), "search_index", None)
+    entries = getattr(search_index, "_entries", None)
+    if not isinstance(entries, list):
+        log.debug("No built in search index to remove generated pages from")
+        return
+    entries[:] = [entry for entry in entries if entry["location"].partition("#")[0] not in excluded_urls]
+    for module in modules:
+        entries.append({"title": module["id"], "text": module["summary"], "location": module["url"]})
+        for member in module["members"]:
+            entries.append({"title": member["id"], "text": member["summary"], "location": member["url"]})
@@ -0,0 +1,96 @@
+import logging
+import os
+from typing import Any, Dict, Optional, Union
+
+import jinja2
+from mkdocs.exceptions import PluginError
+
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+log = logging.getLogger(__name__)
+
+PageTemplate = Union[str, jinja2.Template]
+"""A built in ``str.format`` template or a jinja2 template loaded from a file, both given ``page_context``"""
+
+
+def page_context(module_ref: ModuleRef, member: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+    """
+    Everything a template can use to generate a module's page
+    :param module_ref: The module
+    :param member: The member of the module the page is for, None if it is for the whole module
+    :param extra: Anything else to add, eg: ``member_links`` for the overview of a split module
+    :return: The context
+    """
+    is_package = module_ref.ref_path[-1] == "__init__"
+    id_parts = module_ref.module_id.split(".") if module_ref.module_id else []
+    return {
+        "module_ref": module_ref,
+        "module_id": module_ref.module_id,
+        "module_name": module_ref.module_name,
+        "printable_module_id": module_ref.printable_module_id,
+        "id_parts": id_parts,
+        "parent_id": ".".join(id_parts[:-1]),
+        "is_package": is_package,
+        "source_path": "/".join(module_ref.parts),
+        "member_name": member or "",
+        **extra,
+    }
+
+
+def render_page(template: PageTemplate, context: Dict[str, Any]) -> str:
+    """
+    Generate the markdown content of a page
+    :param template: The page template
+    :param context: Result of ``page_context``
+    :return: Markdown content
+    :raises PluginError: If a jinja2 template fails to render
+    """
+    if isinstance(template, str):
+        return template.format(**context)
+    try:
+        return template.render(context)
+    except jinja2.TemplateError as e:
+        raise PluginError(f"mkdocstrings-python-generator could not render template {template.name} for module "
+                          f"{context['module_id']}: {e}") from e
+
+
+class TemplateLoader:
+    """
+    Loads jinja2 page templates from files.
+
+    Each file is read and compiled once then cached until its mtime or size changes, so a template is checked with
+    one ``stat`` per build however many pages use it and however many ``mkdocs serve`` rebuilds there are.
+    """
+
+    def __init__(self) -> None:
+        # Undefined names are mistakes, don't render them as nothing
+        self._environment = jinja2.Environment(undefined=jinja2.StrictUndefined, keep_trailing_newline=True,
+                                               autoescape=False)
+        self._templates: Dict[str, tuple[int, int, jinja2.Template]] = {}
+
+    def load(self, path: str) -> jinja2.Template:
+        """
+        Load a template, compiling it only if the file changed since the last time
+        :param path: Path to the template file
+        :return: The compiled template
+        :raises PluginError: If the template can't be read or compiled
+        """
+        try:
+            stat = os.stat(path)
+            cached = self._templates.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+            with open(path, encoding="utf8") as template_file:
+                source = template_file.read()
+            template = self._environment.from_string(source)
+        except (OSError, jinja2.TemplateError) as e:
+            raise PluginError(f"mkdocstrings-python-generator could not load template {path}: {e}") from e
+        # Name the template after its file for error messages
+        template.name = path
+        log.debug("Compiled template %s", path)
+        self._templates[path] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
+
+    def clear(self) -> None:
+        """Forget every compiled template"""
+        self._templates = {}
@@ -0,0 +1,70 @@
+"""Benchmark mkdocstrings-python-generator against synthetic package trees
+
+Run from the ``source`` directory::
+
+    python -m tests.benchmark --shape wide deep --modules 1000 10000 50000 --output results.json
+
+Results are written as JSON so that they can be compared between releases.
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tests.benchmark.runner import BENCHMARKS, run_benchmarks
+from tests.benchmark.synthetic import SHAPES, generate_tree
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark", description=__doc__.split("\n")[0])
+    parser.add_argument("--shape", nargs="+", choices=sorted(SHAPES), default=sorted(SHAPES))
+    parser.add_argument("--modules", nargs="+", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--benchmark", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--empty-init-ratio", type=float, default=0.5)
+    parser.add_argument("--ignored-ratio", type=float, default=0.05)
+    parser.add_argument("--output", type=Path, help="File to write results to, default is stdout")
+    args = parser.parse_args(argv)
+
+    # mkdocs is noisy about the synthetic docs, only the results matter here
+    logging.getLogger("mkdocs").setLevel(logging.ERROR)
+
+    results: List[Dict[str, Any]] = []
+    for shape_name in args.shape:
+        for modules in args.modules:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                print(f"Generating {shape_name} tree with {modules} modules", file=sys.stderr)
+                tree = generate_tree(Path(temp_dir, "source"), SHAPES[shape_name], modules, args.empty_init_ratio,
+                                     args.ignored_ratio)
+                for result in run_benchmarks(tree, Path(temp_dir, "work"), args.benchmark, args.repeat):
+                    result.update(shape=shape_name, modules=tree.modules, packages=tree.packages)
+                    print(f"  {result['benchmark']}: {result['min']:.4f}s", file=sys.stderr)
+                    results.append(result)
+
+    document = {
+        "package_version": _package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output is None:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    else:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def _package_version() -> Optional[str]:
+    try:
+        return metadata.version("mkdocstrings-python-generator")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Benchmarks of each stage of the plugin"""
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
+
+import yaml
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import get_files
+from mkdocs.structure.nav import get_navigation
+
+from mkdocstrings_python_generator.discovery import discover_python_files
+from mkdocstrings_python_generator.edit_url import EditUrlFormatter
+from mkdocstrings_python_generator.files_generator import FilesGenerator
+from mkdocstrings_python_generator.nav_util import NavSectionIndex, patch_nav_refs
+from mkdocstrings_python_generator.plugin import MODULE_PAGE, GeneratePythonDocsProcessor
+from tests.benchmark.synthetic import SyntheticTree
+
+T = TypeVar("T")
+
+Timings = Dict[str, float]
+
+
+class BenchmarkContext:
+    """Everything a benchmark needs to run against one synthetic tree"""
+
+    def __init__(self, tree: SyntheticTree, work_dir: Path):
+        """
+        :param tree: Synthetic tree to document
+        :param work_dir: Empty directory to write the mkdocs project into
+        """
+        self.tree = tree
+        self.config_file = work_dir / "mkdocs.yml"
+        (work_dir / "docs").mkdir(parents=True)
+        (work_dir / "docs" / "index.md").write_text("# Benchmark\n")
+        self.config_file.write_text(
+            yaml.safe_dump({
+                "site_name": "Benchmark",
+                "site_dir": str(work_dir / "site"),
+                "repo_url": "https://example.com/repo",
+                "edit_uri": "edit/main/source/",
+                "nav": [{"Home": "index.md"}],
+                "plugins": [{
+                    "mkdocstrings-python-generator": {
+                        "source_dirs": [{
+                            "base": str(tree.base),
+                            "package_dir": str(tree.package_dir),
+                            "ignore": tree.ignore,
+                        }],
+                    },
+                }],
+            }))
+
+    def load_config(self) -> MkDocsConfig:
+        """Load a fresh copy of the mkdocs config, just like each rebuild of mkdocs serve does"""
+        return load_config(str(self.config_file))
+
+    def processor(self, config: MkDocsConfig) -> GeneratePythonDocsProcessor:
+        """Create a processor for the synthetic source directory"""
+        return GeneratePythonDocsProcessor(config.plugins["mkdocstrings-python-generator"].config.source_dirs[0], config)
+
+
+def _timed(function: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def benchmark_discover(context: BenchmarkContext) -> Timings:
+    tree = context.tree
+    _, seconds = _timed(lambda: list(discover_python_files(tree.base, tree.package_dir, tree.ignore)))
+    return {"discover": seconds}
+
+
+def benchmark_generate(context: BenchmarkContext) -> Timings:
+    config = context.load_config()
+    source_config = config.plugins["mkdocstrings-python-generator"].config.source_dirs[0]
+    generator = FilesGenerator(config["site_dir"], config["use_directory_urls"])
+    try:
+        _, cold = _timed(lambda: list(generator.generate_pages_recursive(source_config, MODULE_PAGE)))
+        _, warm = _timed(lambda: list(generator.generate_pages_recursive(source_config, MODULE_PAGE)))
+    finally:
+        generator.cleanup()
+    return {"generate.cold": cold, "generate.warm": warm}
+
+
+def benchmark_nav(context: BenchmarkContext) -> Timings:
+    config = context.load_config()
+    processor = context.processor(config)
+    try:
+        files = get_files(config)
+        processor.on_files(files, config)
+        nav = get_navigation(files, config)
+        pages, prune = _timed(lambda: processor.prune_nav(nav))
+        _, place = _timed(lambda: processor.place_pages(nav, pages, NavSectionIndex(nav)))
+        _, patch = _timed(lambda: patch_nav_refs(nav))
+    finally:
+        processor.on_shutdown()
+    return {"nav.prune": prune, "nav.place": place, "patch_nav_refs": patch}
+
+
+def benchmark_edit_url(context: BenchmarkContext) -> Timings:
+    config = context.load_config()
+    processor = context.processor(config)
+    try:
+        files = get_files(config)
+        processor.on_files(files, config)
+        file_refs = list(processor.generated_files.values())
+        _, per_page = _timed(lambda: [processor.make_edit_url(config, file_ref) for file_ref in file_refs])
+        formatter = EditUrlFormatter.from_config(config, processor.source_config)
+        _, batch = _timed(lambda: list(formatter.resolve(file_refs)))
+    finally:
+        processor.on_shutdown()
+    return {"make_edit_url": per_page, "edit_url.batch": batch}
+
+
+def benchmark_end_to_end(context: BenchmarkContext) -> Timings:
+    """Run every plugin hook up to rendering, as a build and then as a rebuild of mkdocs serve"""
+    timings: Timings = {}
+    config = context.load_config()
+    try:
+        for build in ("cold", "warm"):
+            config = context.load_config()
+            start = time.perf_counter()
+            config, timings[f"end_to_end.{build}.on_config"] = _timed(lambda: config.plugins.on_config(config))
+            files = get_files(config)
+            files, timings[f"end_to_end.{build}.on_files"] = _timed(
+                lambda: config.plugins.on_files(files, config=config))
+            nav = get_navigation(files, config)
+            nav, timings[f"end_to_end.{build}.on_nav"] = _timed(
+                lambda: config.plugins.on_nav(nav, config=config, files=files))
+            pages = [file.page for file in files.documentation_pages() if file.page is not None]
+            _, timings[f"end_to_end.{build}.on_pre_page"] = _timed(
+                lambda: [config.plugins.on_pre_page(page, config=config, files=files) for page in pages])
+            timings[f"end_to_end.{build}.total"] = time.perf_counter() - start
+    finally:
+        config.plugins.on_shutdown()
+    return timings
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Timings]] = {
+    "discover": benchmark_discover,
+    "generate": benchmark_generate,
+    "nav": benchmark_nav,
+    "edit_url": benchmark_edit_url,
+    "end_to_end": benchmark_end_to_end,
+}
+
+
+def run_benchmarks(tree: SyntheticTree, work_dir: Path, benchmarks: Iterable[str],
+                   repeat: int) -> List[Dict[str, Any]]:
+    """
+    Run benchmarks against a synthetic tree
+    :param tree: The tree to document
+    :param work_dir: Empty directory to use for the mkdocs project
+    :param benchmarks: Names of benchmarks to run, see ``BENCHMARKS``
+    :param repeat: Number of times to repeat each benchmark
+    :return: Summary of each measurement in seconds
+    """
+    context = BenchmarkContext(tree, work_dir)
+    results = []
+    for name in benchmarks:
+        measurements: Dict[str, List[float]] = {}
+        for _ in range(repeat):
+            for measurement, seconds in BENCHMARKS[name](context).items():
+                measurements.setdefault(measurement, []).append(seconds)
+        for measurement, all_seconds in measurements.items():
+            results.append({
+                "benchmark": measurement,
+                "repeat": len(all_seconds),
+                "min": min(all_seconds),
+                "median": statistics.median(all_seconds),
+                "max": max(all_seconds),
+            })
+    return results
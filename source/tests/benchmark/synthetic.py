@@ -0,0 +1,96 @@
+"""Synthetic python package trees for benchmarking"""
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+MODULE_CONTENT = '''"""Synthetic module {name}"""
+
+
+def function_{name}(value: int) -> int:
+    """Return the value"""
+    return value
+'''
+
+
+@dataclass(frozen=True)
+class TreeShape:
+    """Shape of a synthetic package tree"""
+    name: str
+    """Name used to report results"""
+    subpackages: int
+    """Number of subpackages in each package until enough modules exist"""
+    modules_per_package: int
+    """Number of modules (excluding ``__init__.py``) in each package"""
+
+
+SHAPES = {
+    "wide": TreeShape("wide", subpackages=20, modules_per_package=100),
+    "deep": TreeShape("deep", subpackages=2, modules_per_package=4),
+}
+
+
+@dataclass(frozen=True)
+class SyntheticTree:
+    """A synthetic package tree written to disk"""
+    base: Path
+    """Base directory containing the package"""
+    package_dir: Path
+    """Top level package"""
+    modules: int
+    """Number of python files written, including ignored and empty ones"""
+    packages: int
+    """Number of packages written"""
+    ignore: List[str]
+    """Ignore patterns to apply"""
+
+
+def generate_tree(base: Path,
+                  shape: TreeShape,
+                  modules: int,
+                  empty_init_ratio: float = 0.5,
+                  ignored_ratio: float = 0.05,
+                  seed: int = 0) -> SyntheticTree:
+    """
+    Write a synthetic package tree
+
+    Packages are filled breadth first so that every package has ``shape.subpackages`` subpackages and
+    ``shape.modules_per_package`` modules until there are ``modules`` python files in total.
+
+    :param base: Directory to write the tree into, the package will be named ``synthetic``
+    :param shape: Shape of the tree
+    :param modules: Number of python files to write
+    :param empty_init_ratio: Share of packages whose ``__init__.py`` is empty
+    :param ignored_ratio: Share of packages which are ignored because they are named ``test_*``
+    :param seed: Random seed, the same arguments always generate the same tree
+    :return: Description of the tree written
+    """
+    rng = random.Random(seed)
+    package_dir = base / "synthetic"
+    queue = [package_dir]
+    written = 0
+    packages = 0
+    position = 0
+    while written < modules:
+        package = queue[position]
+        position += 1
+        package.mkdir(parents=True)
+        packages += 1
+        init_content = "" if rng.random() < empty_init_ratio else MODULE_CONTENT.format(name=package.name)
+        (package / "__init__.py").write_text(init_content)
+        written += 1
+        for module in range(min(shape.modules_per_package, modules - written)):
+            name = f"module_{module}"
+            (package / f"{name}.py").write_text(MODULE_CONTENT.format(name=name))
+            written += 1
+        for subpackage in range(shape.subpackages):
+            # Subpackage names never repeat their parent's name, that clashes with the parent's page in the nav
+            prefix = "test" if rng.random() < ignored_ratio else "package"
+            queue.append(package / f"{prefix}_{packages}_{subpackage}")
+    return SyntheticTree(
+        base=base,
+        package_dir=package_dir,
+        modules=written,
+        packages=packages,
+        ignore=["tests", "test_*", "__main__.py", "*/migrations/*"],
+    )
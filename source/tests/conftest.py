@@ -1,7 +1,15 @@
 import pytest
-from typing import Iterable
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Sequence
 from pathlib import Path
 
+import yaml
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import Files, get_files
+from mkdocs.structure.nav import Navigation, get_navigation
+
 from mkdocstrings_python_generator.files_generator import FilesGenerator
 
 
@@ -15,3 +23,73 @@ def files_generator(tmp_path: Path) -> Iterable[FilesGenerator]:
     generator = FilesGenerator(str(tmp_path / "destination"), use_directory_urls=True)
     yield generator
     generator.cleanup()
+
+
+@pytest.fixture()
+def mkdocs_config(tmp_path: Path) -> MkDocsConfig:
+    config = MkDocsConfig()
+    (tmp_path / "docs").mkdir()
+    config.load_dict({"site_name": "Test", "docs_dir": str(tmp_path / "docs"), "site_dir": str(tmp_path / "site")})
+    errors, _ = config.validate()
+    assert not errors
+    return config
+
+
+class PluginBuild:
+    """Build a site using the plugin from a ``mkdocs.yml`` written to a temporary directory"""
+
+    def __init__(self, tmp_path: Path):
+        self.tmp_path = tmp_path
+
+    def load_config(self, plugin_config: Dict[str, Any], other_plugins: Sequence[Any] = (),
+                    **options: Any) -> MkDocsConfig:
+        """
+        :param plugin_config: Options of the plugin
+        :param other_plugins: Plugins to list before this one
+        :param options: Passed on to ``load_config``, eg: ``site_dir``
+        """
+        (self.tmp_path / "docs").mkdir(exist_ok=True)
+        config_file = self.tmp_path / "mkdocs.yml"
+        config_file.write_text(yaml.safe_dump({
+            "site_name": "Test",
+            "plugins": [*other_plugins, {"mkdocstrings-python-generator": plugin_config}],
+        }))
+        return load_config(str(config_file), **options)
+
+    @contextmanager
+    def nav(self, plugin_config: Dict[str, Any],
+            other_plugins: Sequence[Any] = ()) -> Iterator[tuple[MkDocsConfig, Files, Navigation]]:
+        """
+        Run the plugin up to ``on_nav``, shutting it down on leaving the context
+        :param plugin_config: Options of the plugin
+        :param other_plugins: Plugins to list before this one
+        """
+        config = self.load_config(plugin_config, other_plugins)
+        try:
+            config = config.plugins.on_config(config)
+            files = config.plugins.on_files(get_files(config), config=config)
+            nav = config.plugins.on_nav(get_navigation(files, config), config=config, files=files)
+            yield config, files, nav
+        finally:
+            config.plugins.on_shutdown()
+
+    def site(self, plugin_config: Dict[str, Any], other_plugins: Sequence[Any] = (), site_dir: str = "site") -> Path:
+        """
+        Build the whole site
+        :param plugin_config: Options of the plugin
+        :param other_plugins: Plugins to list before this one
+        :param site_dir: Directory to build the site in, relative to the temporary directory
+        :return: The site directory
+        """
+        config = self.load_config(plugin_config, other_plugins, site_dir=str(self.tmp_path / site_dir))
+        config.plugins.on_startup(command="build", dirty=False)
+        try:
+            build(config)
+        finally:
+            config.plugins.on_shutdown()
+        return self.tmp_path / site_dir
+
+
+@pytest.fixture()
+def plugin_build(tmp_path: Path) -> PluginBuild:
+    return PluginBuild(tmp_path)
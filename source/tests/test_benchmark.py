@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+
+from tests.benchmark.runner import BENCHMARKS, run_benchmarks
+from tests.benchmark.synthetic import SHAPES, generate_tree
+
+
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+def test_synthetic_tree_has_requested_modules(shape: str, tmp_path: Path):
+    tree = generate_tree(tmp_path, SHAPES[shape], 50)
+    assert tree.modules == 50
+    assert len(list(tree.package_dir.rglob("*.py"))) == 50
+
+
+def test_benchmarks_run(tmp_path: Path):
+    tree = generate_tree(tmp_path / "source", SHAPES["deep"], 30)
+    results = run_benchmarks(tree, tmp_path / "work", BENCHMARKS, repeat=1)
+    measured = {result["benchmark"] for result in results}
+    assert {"discover", "generate.cold", "nav.place", "make_edit_url", "end_to_end.warm.total"} <= measured
+    assert all(result["min"] >= 0 for result in results)
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from mkdocstrings_python_generator import cli
+
+
+def test_main_prints_manifest(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    package = tmp_path / "src" / "package"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text('"""Package"""\n')
+    (package / "module.py").write_text("x = 1\n")
+    (package / "empty.py").write_text("")
+    (tmp_path / "docs").mkdir()
+    config_file = tmp_path / "mkdocs.yml"
+    config_file.write_text(yaml.safe_dump({
+        "site_name": "Test",
+        "repo_url": "https://example.com/repo/",
+        "plugins": [{"mkdocstrings-python-generator": {
+            "source_dirs": [{"base": "src", "edit_uri": "edit/main/src/", "nav_heading": ["Reference", "API"]}],
+        }}],
+    }))
+
+    assert cli.main(["-f", str(config_file)]) == 0
+    manifest = json.loads(capsys.readouterr().out)
+    assert manifest["sources"][0]["modules"] == [
+        {
+            "module_id": "package",
+            "member": None,
+            "src_uri": "_ref/package/index.md",
+            "nav_path": ["Reference", "API", "package", "package"],
+            "edit_url": "https://example.com/repo/edit/main/src/package/__init__.py",
+        },
+        {
+            "module_id": "package.module",
+            "member": None,
+            "src_uri": "_ref/package/module.md",
+            "nav_path": ["Reference", "API", "package", "module"],
+            "edit_url": "https://example.com/repo/edit/main/src/package/module.py",
+        },
+    ]
+
+
+def test_main_lists_split_module_pages(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    package = tmp_path / "src" / "package"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text('"""Package"""\n')
+    (package / "module.py").write_text("class Foo:\n    pass\n\n\ndef bar():\n    pass\n")
+    (tmp_path / "docs").mkdir()
+    config_file = tmp_path / "mkdocs.yml"
+    config_file.write_text(yaml.safe_dump({
+        "site_name": "Test",
+        "plugins": [{"mkdocstrings-python-generator": {"source_dirs": [{"base": "src", "split_members": 2}]}}],
+    }))
+
+    assert cli.main(["-f", str(config_file)]) == 0
+    manifest = json.loads(capsys.readouterr().out)
+    assert [(module["module_id"], module["member"], module["src_uri"], module["nav_path"])
+            for module in manifest["sources"][0]["modules"]] == [
+        ("package", None, "_ref/package/index.md", ["Reference", "package", "package"]),
+        # The overview of a split module is the index of its own section, holding a page for each member
+        ("package.module", None, "_ref/package/module.md", ["Reference", "package", "module", "module"]),
+        ("package.module", "Foo", "_ref/package/module.Foo.md", ["Reference", "package", "module", "Foo"]),
+        ("package.module", "bar", "_ref/package/module.bar.md", ["Reference", "package", "module", "bar"]),
+    ]
+
+
+def test_main_fails_without_plugin(tmp_path: Path):
+    (tmp_path / "docs").mkdir()
+    config_file = tmp_path / "mkdocs.yml"
+    config_file.write_text(yaml.safe_dump({"site_name": "Test"}))
+    assert cli.main(["-f", str(config_file)]) == 1
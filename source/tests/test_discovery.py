@@ -0,0 +1,118 @@
+import codecs
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_python_generator import discovery
+
+
+@pytest.mark.parametrize(["content", "empty"], [
+    (b"", True),
+    (b"  \n\t\r\n", True),
+    (codecs.BOM_UTF8 + b"\n", True),
+    (b"\n" * 10000, True),
+    (b"\n" * 10000 + b"x = 1\n", False),
+    (b'"""Docstring"""\n', False),
+])
+def test_is_empty_file(content: bytes, empty: bool, tmp_path: Path):
+    file = tmp_path / "module.py"
+    file.write_bytes(content)
+    assert discovery.is_empty_file(file) is empty
+
+
+@pytest.mark.parametrize(["skip_empty", "expected"], [
+    ("all", {"package.full"}),
+    ("init", {"package.full", "package.empty"}),
+    ("none", {"package", "package.full", "package.empty"}),
+])
+def test_discover_skip_empty(skip_empty: str, expected: set[str], tmp_path: Path):
+    package = tmp_path / "package"
+    package.mkdir()
+    (package / "__init__.py").write_text("\n")
+    (package / "empty.py").write_text("")
+    (package / "full.py").write_text("x = 1\n")
+    results = {v.module_id for v in discovery.discover_python_files(tmp_path, tmp_path, [], skip_empty)}
+    assert results == expected
+
+
+@pytest.mark.parametrize(["pattern", "path", "ignored"], [
+    ("*.py", "foo/bar.py", True),
+    ("bar.py", "foo/bar.py", True),
+    ("bar", "foo/bar.py", False),
+    ("*/migrations/*", "app/migrations/0001.py", True),
+    ("*/migrations/*", "app/migrations", False),
+    ("*/migrations/*", "migrations/0001.py", False),
+    ("*/migrations/*", "app/sub/migrations/0001.py", False),
+    ("build/**", "build", True),
+    ("build/**", "build/lib/foo.py", True),
+    ("build/**", "src/build/foo.py", False),
+    ("/build/*", "build/foo.py", True),
+    ("**/vendor", "vendor", True),
+    ("**/vendor", "a/b/vendor", True),
+    ("a/**/b.py", "a/b.py", True),
+    ("a/**/b.py", "a/x/y/b.py", True),
+    ("a/**/b.py", "ab.py", False),
+    ("a/[!x]/c.py", "a/b/c.py", True),
+    ("a/[!x]/c.py", "a/x/c.py", False),
+    ("a/?/c.py", "a/bb/c.py", False),
+])
+def test_ignore_matcher(pattern: str, path: str, ignored: bool):
+    matcher = discovery.IgnoreMatcher([pattern])
+    assert matcher(path.rsplit("/", 1)[-1], path) is ignored
+
+
+def test_discover_prunes_ignored_directories(tmp_path: Path):
+    package = tmp_path / "package"
+    (package / "build" / "lib").mkdir(parents=True)
+    (package / "app" / "migrations").mkdir(parents=True)
+    (package / "app" / "models.py").write_text("x = 1\n")
+    (package / "app" / "migrations" / "0001.py").write_text("x = 1\n")
+    (package / "build" / "lib" / "copy.py").write_text("x = 1\n")
+    results = [v.module_id for v in discovery.discover_python_files(tmp_path, package, ["build/**", "*/migrations/*"])]
+    assert results == ["package.app.models"]
+
+
+def test_discover_is_ordered_by_name(tmp_path: Path):
+    for name in ["b.py", "a/z.py", "c/a.py", "a.py"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("x = 1\n")
+    results = [v.module_id for v in discovery.discover_python_files(tmp_path, tmp_path, [])]
+    assert results == ["a.z", "a", "b", "c.a"]
+
+
+def _write_modules(root: Path, *names: str) -> None:
+    for name in names:
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text("x = 1\n")
+
+
+def test_discover_respects_gitignore(tmp_path: Path):
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("excluded.py\n")
+    (tmp_path / ".gitignore").write_text("build/\n*_pb2.py\n")
+    _write_modules(tmp_path / "src" / "package", "__init__.py", "main.py", "excluded.py", "api_pb2.py",
+                   "build/lib.py", "generated/out.py", "generated/keep.py", "local/mine.py")
+    (tmp_path / "src" / "package" / "generated" / ".gitignore").write_text("*\n!keep.py\n")
+    (tmp_path / "src" / "package" / "local" / ".ignore").write_text("mine.py\n")
+    results = {
+        v.module_id
+        for v in discovery.discover_python_files(tmp_path / "src", tmp_path / "src", [], respect_gitignore=True)
+    }
+    assert results == {"package", "package.main", "package.generated.keep"}
+
+
+def test_discover_ignores_gitignore_by_default(tmp_path: Path):
+    (tmp_path / ".gitignore").write_text("*.py\n")
+    _write_modules(tmp_path, "package/main.py")
+    results = {v.module_id for v in discovery.discover_python_files(tmp_path, tmp_path, [])}
+    assert results == {"package.main"}
+
+
+def test_gitignore_outside_work_tree_is_not_used(tmp_path: Path):
+    (tmp_path / ".gitignore").write_text("*.py\n")
+    _write_modules(tmp_path / "package", "main.py")
+    results = {
+        v.module_id
+        for v in discovery.discover_python_files(tmp_path, tmp_path / "package", [], respect_gitignore=True)
+    }
+    assert results == {"package.main"}
@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import File
+from mkdocs.structure.pages import Page
+
+from mkdocstrings_python_generator.config import SourceConfig
+from mkdocstrings_python_generator.edit_url import EditUrlFormatter
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+
+def _mkdocs_edit_url(repo_url: Optional[str], edit_uri: Optional[str], edit_uri_template: Optional[str],
+                     path: str) -> Optional[str]:
+    """What mkdocs itself would produce for a markdown page at the same path"""
+    config = MkDocsConfig()
+    config["repo_url"] = repo_url
+    config["edit_uri"] = edit_uri
+    config["edit_uri_template"] = edit_uri_template
+    config["site_dir"] = "site"
+    config["use_directory_urls"] = True
+    return Page(None, File(path, src_dir="", dest_dir="site", use_directory_urls=True), config).edit_url
+
+
+@pytest.mark.parametrize(["repo_url", "edit_uri", "edit_uri_template"], [
+    ("https://github.com/example/repo", "edit/main/source/", None),
+    ("https://github.com/example/repo/", "edit/main/source/", None),
+    ("https://github.com/example/repo", None, "edit/main/source/{path}"),
+    ("https://github.com/example/repo", None, "edit/main/{path_noext}.py?plain=1"),
+    ("https://github.com/example/repo", "?path=/", None),
+    ("https://github.com/example/repo", "/other/repo/edit/", None),
+    (None, "https://github.com/example/repo/edit/main/", None),
+    ("https://github.com/example/repo", None, None),
+])
+def test_edit_url_matches_mkdocs(repo_url: Optional[str], edit_uri: Optional[str], edit_uri_template: Optional[str],
+                                 tmp_path: Path):
+    module_ref = ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")
+    formatter = EditUrlFormatter(repo_url, edit_uri, edit_uri_template)
+    assert formatter(module_ref) == _mkdocs_edit_url(repo_url, edit_uri, edit_uri_template, "foo/bar.py")
+
+
+def test_edit_uri_gets_trailing_slash(tmp_path: Path):
+    module_ref = ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")
+    formatter = EditUrlFormatter("https://github.com/example/repo", "edit/main/source", None)
+    assert formatter(module_ref) == "https://github.com/example/repo/edit/main/source/foo/bar.py"
+
+
+@pytest.mark.parametrize(["source_options", "expected"], [
+    ({}, "https://github.com/example/repo/edit/main/docs/foo/bar.py"),
+    ({"edit_uri": "edit/main/source/"}, "https://github.com/example/repo/edit/main/source/foo/bar.py"),
+    ({"edit_uri_template": "blob/main/{path}"}, "https://github.com/example/repo/blob/main/foo/bar.py"),
+])
+def test_source_config_overrides_mkdocs(source_options: dict, expected: str, tmp_path: Path):
+    config = MkDocsConfig()
+    config["repo_url"] = "https://github.com/example/repo"
+    config["edit_uri"] = "edit/main/docs/"
+    config["edit_uri_template"] = None
+    source_config = SourceConfig()
+    source_config.load_dict({"base": str(tmp_path), **source_options})
+    source_config.validate()
+    module_ref = ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")
+    assert EditUrlFormatter.from_config(config, source_config)(module_ref) == expected
@@ -1,5 +1,10 @@
+import shutil
 from pathlib import Path
+
 from mkdocstrings_python_generator import files_generator
+from mkdocstrings_python_generator.config import SourceConfig
+from mkdocstrings_python_generator.files_generator import SplitModules
+from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef
 
 
 def test_discover_python_files_has_correct_base(example_files: Path):
@@ -54,3 +59,84 @@ def test_non_wildcard_ignore_is_discriminative(example_files: Path):
     results = {v.module_id for v in files_generator.discover_python_files(example_files, example_files, ["baz.py"])}
     assert "sub_package.baz" not in results
     assert "sub_package.baz_bob" in results
+
+
+def _copy_example(example_files: Path, tmp_path: Path) -> Path:
+    source = tmp_path / "source"
+    shutil.copytree(example_files, source / "example")
+    return source
+
+
+def _generate(generator: files_generator.FilesGenerator, source: Path) -> dict[str, GeneratedFileRef]:
+    source_config = SourceConfig()
+    source_config.load_dict({"base": str(source), "package_dir": str(source / "example"), "ignore": []})
+    return {
+        ref.module_ref.module_id: ref
+        for ref in generator.generate_pages_recursive(source_config, template="::: {module_id}\n")
+    }
+
+
+def test_unchanged_modules_reuse_pages(files_generator: files_generator.FilesGenerator, example_files: Path,
+                                       tmp_path: Path):
+    source = _copy_example(example_files, tmp_path)
+    first = _generate(files_generator, source)
+    second = _generate(files_generator, source)
+    assert first.keys() == second.keys()
+    assert all(second[module_id].file is first[module_id].file for module_id in first)
+
+
+def test_changed_module_rewrites_page(files_generator: files_generator.FilesGenerator, example_files: Path,
+                                      tmp_path: Path):
+    source = _copy_example(example_files, tmp_path)
+    first = _generate(files_generator, source)
+    (source / "example" / "foo.py").write_text('"""Changed"""\n\n\nclass Foo:\n    ...\n')
+    second = _generate(files_generator, source)
+    assert second["example.foo"].file is not first["example.foo"].file
+    assert second["example.bar"].file is first["example.bar"].file
+    assert second["example.foo"].file.content_string == "::: example.foo\n"
+
+
+def test_removed_module_deletes_page(files_generator: files_generator.FilesGenerator, example_files: Path,
+                                     tmp_path: Path):
+    source = _copy_example(example_files, tmp_path)
+    first = _generate(files_generator, source)
+    (source / "example" / "foo.py").unlink()
+    second = _generate(files_generator, source)
+    assert "example.foo" not in second
+    assert not Path(first["example.foo"].file.abs_src_path or "").exists()
+
+
+def test_in_memory_pages_are_not_written(example_files: Path, tmp_path: Path):
+    generator = files_generator.FilesGenerator(str(tmp_path / "destination"), use_directory_urls=True, in_memory=True)
+    source = _copy_example(example_files, tmp_path)
+    generated = _generate(generator, source)
+    assert generated["example.foo"].doc_file_path is None
+    assert generated["example.foo"].file.content_string == "::: example.foo\n"
+    assert generated["example.foo"].file.src_uri == "_ref/example/foo.md"
+    assert generated["example"].file.src_uri == "_ref/example/index.md"
+    generator.cleanup()
+
+
+def test_split_modules_generate_member_pages(files_generator: files_generator.FilesGenerator, example_files: Path,
+                                             tmp_path: Path):
+    source = _copy_example(example_files, tmp_path)
+    module_ref = ModuleRef(source, source / "example" / "foo.py")
+    split = SplitModules(
+        members=lambda ref: ("Foo", "bar") if ref == module_ref else (),
+        overview_template="::: {module_id}\n{member_links}\n",
+        member_template="::: {module_id}.{member_name}\n",
+    )
+    generated = list(files_generator.generate_pages([module_ref], "::: {module_id}\n", split=split))
+    assert [(ref.member, ref.split, ref.file.src_uri) for ref in generated] == [
+        (None, True, "_ref/example/foo.md"),
+        ("Foo", False, "_ref/example/foo.Foo.md"),
+        ("bar", False, "_ref/example/foo.bar.md"),
+    ]
+    assert Path(generated[0].doc_file_path or "").read_text() == (
+        "::: example.foo\n- [`Foo`](foo.Foo.md)\n- [`bar`](foo.bar.md)\n")
+    assert Path(generated[1].doc_file_path or "").read_text() == "::: example.foo.Foo\n"
+
+    # Dropping below the threshold removes the member pages
+    unsplit = list(files_generator.generate_pages([module_ref], "::: {module_id}\n"))
+    assert [ref.file.src_uri for ref in unsplit] == ["_ref/example/foo.md"]
+    assert not Path(generated[1].doc_file_path or "").exists()
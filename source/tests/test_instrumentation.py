@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+from mkdocstrings_python_generator import discovery
+from mkdocstrings_python_generator.instrumentation import SourceStats
+from tests.conftest import PluginBuild
+
+
+def _write_package(base: Path) -> None:
+    package = base / "package"
+    (package / "sub").mkdir(parents=True)
+    (package / "tests").mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "module.py").write_text("x = 1\n")
+    (package / "sub" / "__init__.py").write_text("x = 1\n")
+    (package / "tests" / "test_module.py").write_text("x = 1\n")
+
+
+def test_discover_counts(tmp_path: Path):
+    _write_package(tmp_path)
+    stats = SourceStats(base=str(tmp_path), package_dir=None)
+    modules = list(discovery.discover_python_files(tmp_path, tmp_path, ["tests"], stats=stats))
+    assert len(modules) == 2
+    # package, its four entries and sub/__init__.py
+    assert stats.files_scanned == 6
+    assert stats.files_skipped_ignored == 1
+    assert stats.files_skipped_empty == 1
+
+
+def test_plugin_report(tmp_path: Path, plugin_build: PluginBuild):
+    _write_package(tmp_path / "source")
+    plugin_config = {
+        "source_dirs": [{"base": str(tmp_path / "source")}],
+        "instrumentation": True,
+        "instrumentation_file": "stats/instrumentation.json",
+    }
+    with plugin_build.nav(plugin_config) as (config, files, _):
+        for file in files.documentation_pages():
+            assert file.page is not None
+            config.plugins.on_pre_page(file.page, config=config, files=files)
+        config.plugins.on_post_build(config=config)
+
+    sources = json.loads((tmp_path / "stats" / "instrumentation.json").read_text())["sources"]
+    assert len(sources) == 1
+    source = sources[0]
+    assert set(source["timings"]) == {"on_files", "on_nav", "on_pre_page", "on_shutdown"}
+    assert source["pages_generated"] == source["pages_written"] == 2
+    assert source["files_skipped_empty"] == 1
+    assert source["files_skipped_ignored"] == 1
+    assert source["nav_sections_created"] > 0
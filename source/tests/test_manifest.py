@@ -0,0 +1,81 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from mkdocstrings_python_generator import discovery
+from mkdocstrings_python_generator.manifest import MANIFEST_VERSION, DiscoveryManifest
+
+
+def _age(path: Path, seconds: int = 100) -> None:
+    """Make everything look like it was last modified well before the manifest is recorded"""
+    then = time.time() - seconds
+    for dir_path, _, file_names in os.walk(path):
+        for name in file_names:
+            os.utime(os.path.join(dir_path, name), (then, then))
+        os.utime(dir_path, (then, then))
+
+
+@pytest.fixture()
+def source(tmp_path: Path) -> Path:
+    package = tmp_path / "source" / "package"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "a.py").write_text("x = 1\n")
+    (package / "sub" / "__init__.py").write_text("x = 1\n")
+    (package / "sub" / "b.py").write_text("\n")
+    _age(tmp_path / "source")
+    return tmp_path / "source"
+
+
+def _discover(source: Path, manifest_path: Path) -> tuple[List[str], DiscoveryManifest]:
+    manifest = DiscoveryManifest.load(manifest_path)
+    modules = [module_ref.module_id for module_ref in
+               discovery.discover_python_files(source, source, [], manifest=manifest)]
+    manifest.save()
+    return modules, manifest
+
+
+def test_manifest_is_reused(source: Path, tmp_path: Path):
+    manifest_path = tmp_path / "cache" / "manifest.json"
+    expected = [module_ref.module_id for module_ref in discovery.discover_python_files(source, source, [])]
+    modules, manifest = _discover(source, manifest_path)
+    assert modules == expected
+    assert manifest.directories_reused == manifest.files_reused == 0
+
+    modules, manifest = _discover(source, manifest_path)
+    assert modules == expected
+    assert manifest.directories_reused == 3
+    assert manifest.files_reused == 4
+
+
+def test_manifest_sees_changes(source: Path, tmp_path: Path):
+    manifest_path = tmp_path / "manifest.json"
+    _discover(source, manifest_path)
+    (source / "package" / "sub" / "b.py").write_text("x = 1\n")
+    (source / "package" / "a.py").unlink()
+    (source / "package" / "c.py").write_text("x = 1\n")
+    modules, manifest = _discover(source, manifest_path)
+    assert modules == ["package.c", "package.sub", "package.sub.b"]
+    # Only package/ changed, the top directory and package/sub/ were not listed again
+    assert manifest.directories_reused == 2
+
+
+def test_recently_modified_is_checked_again(source: Path, tmp_path: Path):
+    manifest_path = tmp_path / "manifest.json"
+    _age(source, seconds=0)
+    _discover(source, manifest_path)
+    _, manifest = _discover(source, manifest_path)
+    assert manifest.directories_reused == manifest.files_reused == 0
+
+
+@pytest.mark.parametrize("content", ["not json", json.dumps({"version": MANIFEST_VERSION + 1, "directories": {}})])
+def test_unusable_manifest_is_ignored(content: str, source: Path, tmp_path: Path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(content)
+    modules, manifest = _discover(source, manifest_path)
+    assert modules == ["package.a", "package.sub"]
+    assert json.loads(manifest_path.read_text())["version"] == MANIFEST_VERSION
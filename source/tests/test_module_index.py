@@ -0,0 +1,216 @@
+from pathlib import Path
+from typing import List, Set
+
+import pytest
+import yaml
+from mkdocs.config import load_config
+from mkdocs.structure.files import get_files
+from watchdog.events import (DirCreatedEvent, DirDeletedEvent, DirMovedEvent, FileCreatedEvent, FileDeletedEvent,
+                             FileModifiedEvent, FileMovedEvent, FileSystemEvent)
+
+from mkdocstrings_python_generator import discovery
+from mkdocstrings_python_generator.config import SourceConfig
+from mkdocstrings_python_generator.module_index import ModuleIndex
+
+
+def _source_config(tmp_path: Path, **options) -> SourceConfig:
+    source_config = SourceConfig()
+    source_config.load_dict({"base": str(tmp_path / "source"), **options})
+    errors, _ = source_config.validate()
+    assert not errors
+    return source_config
+
+
+def _discover(source_config: SourceConfig) -> List[str]:
+    base = Path(source_config.base)
+    return [module_ref.module_id for module_ref in discovery.discover_python_files(
+        base, base, source_config.ignore, source_config.skip_empty, source_config.respect_gitignore)]
+
+
+@pytest.fixture()
+def package(tmp_path: Path) -> Path:
+    package = tmp_path / "source" / "package"
+    (package / "sub").mkdir(parents=True)
+    (package / "tests").mkdir()
+    (package / "__init__.py").write_text("x = 1\n")
+    (package / "a.py").write_text("x = 1\n")
+    (package / "sub" / "__init__.py").write_text("")
+    (package / "sub" / "b.py").write_text("x = 1\n")
+    (package / "tests" / "test_a.py").write_text("x = 1\n")
+    return package
+
+
+def _index(source_config: SourceConfig) -> ModuleIndex:
+    base = Path(source_config.base)
+    return ModuleIndex(source_config, discovery.discover_python_files(base, base, source_config.ignore))
+
+
+def _changes(package: Path) -> List[FileSystemEvent]:
+    (package / "c.py").write_text("x = 1\n")
+    (package / "empty.py").write_text("")
+    (package / "sub" / "__init__.py").write_text("x = 1\n")
+    (package / "a.py").unlink()
+    (package / "sub" / "b.py").rename(package / "sub" / "renamed.py")
+    (package / "tests" / "test_b.py").write_text("x = 1\n")
+    moved = package.parent / "outside"
+    (moved / "inner").mkdir(parents=True)
+    (moved / "inner" / "d.py").write_text("x = 1\n")
+    moved.rename(package / "moved")
+    (package / "new" / "deleted").mkdir(parents=True)
+    (package / "new" / "deleted" / "e.py").write_text("x = 1\n")
+    (package / "new" / "deleted" / "e.py").unlink()
+    (package / "new" / "deleted").rmdir()
+    return [
+        FileCreatedEvent(str(package / "c.py")),
+        FileCreatedEvent(str(package / "empty.py")),
+        FileModifiedEvent(str(package / "sub" / "__init__.py")),
+        FileDeletedEvent(str(package / "a.py")),
+        FileMovedEvent(str(package / "sub" / "b.py"), str(package / "sub" / "renamed.py")),
+        FileCreatedEvent(str(package / "tests" / "test_b.py")),
+        DirMovedEvent(str(package.parent / "outside"), str(package / "moved")),
+        DirCreatedEvent(str(package / "new")),
+        DirCreatedEvent(str(package / "new" / "deleted")),
+        FileCreatedEvent(str(package / "new" / "deleted" / "e.py")),
+        DirDeletedEvent(str(package / "new" / "deleted")),
+    ]
+
+
+def test_events_match_discovery(package: Path, tmp_path: Path):
+    source_config = _source_config(tmp_path)
+    module_index = _index(source_config)
+    for event in _changes(package):
+        module_index.record(event)
+    assert [module_ref.module_id for module_ref in module_index.modules()] == _discover(source_config)
+    assert "package.moved.inner.d" in _discover(source_config)
+
+
+def test_events_are_not_applied_until_modules(package: Path, tmp_path: Path):
+    module_index = _index(_source_config(tmp_path))
+    before = [module_ref.module_id for module_ref in module_index.modules()]
+    (package / "c.py").write_text("x = 1\n")
+    assert [module_ref.module_id for module_ref in module_index.modules()] == before
+    module_index.record(FileCreatedEvent(str(package / "c.py")))
+    assert "package.c" in [module_ref.module_id for module_ref in module_index.modules()]
+
+
+def test_closed_index_ignores_events(package: Path, tmp_path: Path):
+    module_index = _index(_source_config(tmp_path))
+    module_index.close()
+    (package / "c.py").write_text("x = 1\n")
+    module_index.record(FileCreatedEvent(str(package / "c.py")))
+    assert "package.c" not in [module_ref.module_id for module_ref in module_index.modules()]
+
+
+def test_changed_config_searches_again(package: Path, tmp_path: Path):
+    module_index = _index(_source_config(tmp_path))
+    source_config = _source_config(tmp_path, ignore=["sub"])
+    module_index.update_config(source_config)
+    assert [module_ref.module_id for module_ref in module_index.modules()] == _discover(source_config)
+
+
+def test_changed_gitignore_searches_again(package: Path, tmp_path: Path):
+    source_config = _source_config(tmp_path, respect_gitignore=True)
+    module_index = _index(source_config)
+    (package / ".gitignore").write_text("sub/\n")
+    module_index.record(FileCreatedEvent(str(package / ".gitignore")))
+    modules = [module_ref.module_id for module_ref in module_index.modules()]
+    assert modules == _discover(source_config)
+    assert "package.sub.b" not in modules
+
+
+def test_ignored_directory_moved_in_is_not_searched(package: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source_config = _source_config(tmp_path, respect_gitignore=True)
+    (package / ".gitignore").write_text(".venv/\n")
+    module_index = _index(source_config)
+    outside = tmp_path / "outside"
+    (outside / ".venv" / "lib").mkdir(parents=True)
+    (outside / ".venv" / "lib" / "site.py").write_text("x = 1\n")
+    (outside / "new" / "tests").mkdir(parents=True)
+    (outside / "new" / "c.py").write_text("x = 1\n")
+    (outside / "new" / "tests" / "test_c.py").write_text("x = 1\n")
+    (outside / ".venv").rename(package / ".venv")
+    (outside / "new").rename(package / "new")
+
+    scanned: List[str] = []
+    loaded: List[Path] = []
+    scan_sorted = discovery._scan_sorted
+    for_directory = discovery.VcsIgnore.for_directory
+
+    def record_scan(directory):
+        scanned.append(str(directory))
+        return scan_sorted(directory)
+
+    def record_load(directory):
+        loaded.append(directory)
+        return for_directory(directory)
+
+    monkeypatch.setattr(discovery, "_scan_sorted", record_scan)
+    monkeypatch.setattr(discovery.VcsIgnore, "for_directory", record_load)
+    module_index.record(DirMovedEvent(str(outside / ".venv"), str(package / ".venv")))
+    module_index.record(DirMovedEvent(str(outside / "new"), str(package / "new")))
+    module_index.record(FileCreatedEvent(str(package / "new" / "c.py")))
+    modules = [module_ref.module_id for module_ref in module_index.modules()]
+
+    # Neither the ignored directory nor the ignored tests directory inside the new one are listed
+    assert scanned == [str(package / "new")]
+    # Ignore files are read once for the whole batch of events
+    assert len(loaded) == 1
+    assert "package.new.c" in modules
+    assert modules == _discover(source_config)
+
+
+def test_directory_moved_out_is_removed(package: Path, tmp_path: Path):
+    source_config = _source_config(tmp_path)
+    module_index = _index(source_config)
+    (package / "sub").rename(tmp_path / "sub")
+    module_index.record(DirMovedEvent(str(package / "sub"), str(tmp_path / "sub")))
+    modules = [module_ref.module_id for module_ref in module_index.modules()]
+
+    assert "package.sub.b" not in modules
+    assert modules == _discover(source_config)
+
+
+def test_plugin_serve_uses_index(package: Path, tmp_path: Path):
+    class Observer:
+        def __init__(self):
+            self.handlers = []
+
+        def schedule(self, handler, path, recursive):
+            self.handlers.append((handler, path))
+
+    class Server:
+        def __init__(self):
+            self.watched: List[str] = []
+            self.observer = Observer()
+
+        def watch(self, path):
+            self.watched.append(path)
+
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "mkdocs.yml").write_text(yaml.safe_dump({
+        "site_name": "Test",
+        "plugins": [{"mkdocstrings-python-generator": {"source_dirs": [{"base": str(tmp_path / "source")}]}}],
+    }))
+
+    def build() -> Set[str]:
+        config = load_config(str(tmp_path / "mkdocs.yml"))
+        config = config.plugins.on_config(config)
+        files = config.plugins.on_files(get_files(config), config=config)
+        return {file.src_uri for file in files}
+
+    config = load_config(str(tmp_path / "mkdocs.yml"))
+    try:
+        build()
+        server = Server()
+        config.plugins.on_serve(server, config=config, builder=build)  # type: ignore[arg-type]
+        assert server.watched == [str(tmp_path / "source")]
+        (handler, path), = server.observer.handlers
+        assert path == str(tmp_path / "source")
+
+        # Without an event the new module is not seen: the tree is not searched again
+        (package / "c.py").write_text("x = 1\n")
+        assert "_ref/package/c.md" not in build()
+        handler.dispatch(FileCreatedEvent(str(package / "c.py")))
+        assert "_ref/package/c.md" in build()
+    finally:
+        config.plugins.on_shutdown()
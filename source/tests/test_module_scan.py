@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_python_generator import module_scan
+from mkdocstrings_python_generator.instrumentation import SourceStats
+from mkdocstrings_python_generator.module_scan import ModuleSummary
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+
+@pytest.mark.parametrize(["source", "summary"], [
+    ("", ModuleSummary(False, False, False)),
+    ('"""Docstring\n\nMore"""\n', ModuleSummary(True, False, False, summary="Docstring")),
+    ("def function():\n    pass\n", ModuleSummary(False, True, False, ("function", ), member_summaries=("", ))),
+    ('class A:\n    """\n    Summary\n    :param x: X\n    """\n',
+     ModuleSummary(False, True, False, ("A", ), member_summaries=("Summary", ))),
+    ("class _Private:\n    pass\n_value = 1\n__version__ = '1'\n", ModuleSummary(False, False, False)),
+    ("value: int = 1\n", ModuleSummary(False, True, False)),
+    ("from os import path\n", ModuleSummary(False, False, False)),
+    ("from os import path\n__all__ = ['path']\n", ModuleSummary(False, False, True)),
+    ("from os import path\n__all__ = ['_path']\n", ModuleSummary(False, False, False)),
+    ("__all__ = names()\n", ModuleSummary(False, False, True)),
+    ("try:\n    import json\nexcept ImportError:\n    def loads():\n        pass\n",
+     ModuleSummary(False, True, False, ("loads", ), member_summaries=("", ))),
+    ("class A:\n    pass\ndef b():\n    pass\ndef _c():\n    pass\n__all__ = ['b']\n",
+     ModuleSummary(False, True, True, ("b", ), member_summaries=("", ))),
+    ("if TYPE_CHECKING:\n    Alias = int\n", ModuleSummary(False, True, False)),
+    ("def broken(:\n", module_scan.DOCUMENTED),
+])
+def test_scan_module(source: str, summary: ModuleSummary, tmp_path: Path):
+    path = tmp_path / "module.py"
+    path.write_text(source)
+    assert module_scan.scan_module(str(path)) == summary
+
+
+@pytest.mark.parametrize(["summary", "none", "empty", "private"], [
+    (ModuleSummary(False, False, False), True, False, False),
+    (ModuleSummary(True, False, False), True, True, True),
+    (ModuleSummary(False, True, False), True, True, True),
+    (ModuleSummary(False, False, True), True, True, False),
+])
+def test_should_document(summary: ModuleSummary, none: bool, empty: bool, private: bool):
+    assert module_scan.should_document(summary, "none") is none
+    assert module_scan.should_document(summary, "empty") is empty
+    assert module_scan.should_document(summary, "private") is private
+
+
+def test_scanner_filter(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / "documented.py").write_text('"""Docstring"""\n')
+    (tmp_path / "undocumented.py").write_text("import os\n")
+    module_refs = [ModuleRef(tmp_path, tmp_path / "documented.py"), ModuleRef(tmp_path, tmp_path / "undocumented.py")]
+    scanner = module_scan.ModuleScanner("empty")
+    stats = SourceStats(base=str(tmp_path), package_dir=None)
+    scanned = []
+    scan_module = module_scan.scan_module
+
+    def counting_scan_module(path: str) -> ModuleSummary:
+        scanned.append(path)
+        return scan_module(path)
+
+    monkeypatch.setattr(module_scan, "scan_module", counting_scan_module)
+
+    assert [module_ref.module_id for module_ref in scanner.filter(module_refs, stats)] == ["documented"]
+    assert stats.modules_skipped_undocumented == 1
+    assert len(scanned) == 2
+
+    # Only the changed file is scanned again
+    (tmp_path / "undocumented.py").write_text("def function():\n    pass\n")
+    assert [module_ref.module_id for module_ref in scanner.filter(module_refs)] == ["documented", "undocumented"]
+    assert scanned[2:] == [str(tmp_path / "undocumented.py")]
+
+
+def test_split_members(tmp_path: Path):
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "__init__.py").write_text("class A:\n    pass\nclass B:\n    pass\n")
+    (tmp_path / "package" / "large.py").write_text("class A:\n    pass\nclass B:\n    pass\n")
+    (tmp_path / "package" / "small.py").write_text("class A:\n    pass\n")
+    members = module_scan.ModuleScanner("none").split_members(2)
+
+    assert members(ModuleRef(tmp_path, tmp_path / "package" / "large.py")) == ("A", "B")
+    assert members(ModuleRef(tmp_path, tmp_path / "package" / "small.py")) == ()
+    assert members(ModuleRef(tmp_path, tmp_path / "package" / "__init__.py")) == ()
@@ -0,0 +1,130 @@
+import dataclasses
+from pathlib import Path
+
+import pytest
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.exceptions import PluginError
+from mkdocs.structure import StructureItem
+from mkdocs.structure.files import File
+from mkdocs.structure.nav import Navigation, Section
+from mkdocs.structure.pages import Page
+
+from mkdocstrings_python_generator import nav_util
+from mkdocstrings_python_generator.reference_data import GeneratedFileRef, ModuleRef, PageRef
+
+
+def _page(title: str, path: str, config: MkDocsConfig) -> Page:
+    return Page(title, File(path, src_dir=None, dest_dir="site", use_directory_urls=True), config)
+
+
+def _page_ref(module: str, config: MkDocsConfig, tmp_path: Path) -> PageRef:
+    module_ref = ModuleRef(tmp_path, tmp_path.joinpath(*module.split(".")).with_suffix(".py"))
+    page = _page(module, f"_ref/{module}.md", config)
+    return PageRef(page=page, file=GeneratedFileRef(module_ref=module_ref, doc_file_path=None, file=page.file))
+
+
+def test_section_index_creates_sections_once(mkdocs_config: MkDocsConfig):
+    nav = Navigation([], [])
+    index = nav_util.NavSectionIndex(nav)
+    children = index.get_section(("Reference", "foo", "bar"))
+    assert index.get_section(("Reference", "foo", "bar")) is children
+    assert index.sections_created == 3
+    assert [item.title for item in nav.items] == ["Reference"]
+
+
+def test_section_index_reuses_existing_sections(mkdocs_config: MkDocsConfig):
+    existing = Section("Reference", [_page("Intro", "intro.md", mkdocs_config)])
+    nav = Navigation([existing], [])
+    index = nav_util.NavSectionIndex(nav)
+    assert index.get_section(("Reference", )) is existing.children
+    assert index.sections_created == 0
+
+
+def test_section_index_refuses_to_replace_a_page(mkdocs_config: MkDocsConfig):
+    nav = Navigation([], [])
+    index = nav_util.NavSectionIndex(nav)
+    index.add_item(("Reference", ), _page("foo", "foo.md", mkdocs_config))
+    with pytest.raises(PluginError):
+        index.get_section(("Reference", "foo"))
+
+
+def test_add_page_to_nav_hides_namespace(mkdocs_config: MkDocsConfig, tmp_path: Path):
+    nav = Navigation([], [])
+    index = nav_util.NavSectionIndex(nav)
+    for module in ["name_space.foo.bar", "name_space.foo.baz", "other.qux"]:
+        nav_util.add_page_to_nav(nav, _page_ref(module, mkdocs_config, tmp_path), ("Reference", ), ("name_space", ),
+                                 section_index=index)
+    reference = nav.items[0]
+    assert isinstance(reference, Section)
+    assert [item.title for item in reference.children] == ["foo", "other"]
+    foo = reference.children[0]
+    assert isinstance(foo, Section)
+    assert [item.title for item in foo.children] == ["bar", "baz"]
+
+
+def test_add_page_to_nav_nests_split_module(mkdocs_config: MkDocsConfig, tmp_path: Path):
+    nav = Navigation([], [])
+    overview = _page_ref("foo.bar", mkdocs_config, tmp_path)
+    overview = overview._replace(file=dataclasses.replace(overview.file, split=True))
+    member = _page_ref("foo.bar", mkdocs_config, tmp_path)
+    member = member._replace(file=dataclasses.replace(member.file, member="Baz"))
+    for page_ref in [overview, member]:
+        nav_util.add_page_to_nav(nav, page_ref, ("Reference", ), ())
+    bar = nav.items[0].children[0].children[0]
+    assert isinstance(bar, Section)
+    assert bar.title == "bar"
+    assert [item.title for item in bar.children] == ["bar", "Baz"]
+
+
+def test_prune_generated_pages_removes_empty_sections(mkdocs_config: MkDocsConfig, tmp_path: Path):
+    generated = _page_ref("foo.bar", mkdocs_config, tmp_path)
+    kept = _page("Intro", "intro.md", mkdocs_config)
+    nav = Navigation([kept, Section("👻", [generated.page])], [])
+    pruned = nav_util.prune_generated_pages(nav.items, {generated.page.file.src_path: generated.file})
+    assert [page_ref.page for page_ref in pruned] == [generated.page]
+    assert nav.items == [kept]
+
+
+def test_patch_nav_refs_links_pages_in_order(mkdocs_config: MkDocsConfig):
+    pages = [_page(str(i), f"{i}.md", mkdocs_config) for i in range(3)]
+    section = Section("Section", list[StructureItem](pages[1:]))
+    nav = Navigation([pages[0], section], pages)
+    nav_util.patch_nav_refs(nav)
+    assert [page.previous_page for page in pages] == [None, pages[0], pages[1]]
+    assert [page.next_page for page in pages] == [pages[1], pages[2], None]
+    assert pages[1].parent is section
+
+
+def test_collapsed_nav(mkdocs_config: MkDocsConfig, tmp_path: Path):
+    home = _page("Home", "index.md", mkdocs_config)
+    nav = Navigation([home], [home])
+    reference = Navigation([], [])
+    reference_index = nav_util.NavSectionIndex(reference)
+    page_refs = [_page_ref(module, mkdocs_config, tmp_path) for module in ["foo.a", "foo.b", "foo.bar.c", "qux"]]
+    for page_ref in page_refs:
+        nav_util.add_page_to_nav(reference, page_ref, ("API", "Reference"), (), section_index=reference_index)
+    collapsed = nav_util.CollapsedNav(nav, reference)
+    collapsed.add_stubs([("API", "Reference"), ("API", "Reference", "foo")], nav_util.NavSectionIndex(nav))
+
+    # The site nav has a single link to the first page
+    assert str(nav) == ("Page(title='Home', url='./')\n"
+                        "Section(title='API')\n"
+                        "    Link(title='Reference', url='_ref/foo.a/')")
+    assert collapsed.page_nav(home) is None
+
+    page_nav = collapsed.page_nav(page_refs[0].page)
+    assert page_nav is not None
+    assert str(page_nav) == ("Page(title='Home', url='./')\n"
+                             "Section(title='API')\n"
+                             "    Section(title='Reference')\n"
+                             "        Section(title='foo')\n"
+                             "            Page(title='a', url='_ref/foo.a/')\n"
+                             "            Page(title='b', url='_ref/foo.b/')\n"
+                             "            Link(title='bar', url='_ref/foo.bar.c/')")
+    # Ancestors are still the reference's sections, for breadcrumbs
+    assert [section.title for section in page_refs[0].page.ancestors] == ["foo", "Reference", "API"]
+    assert page_refs[1].page.next_page is page_refs[2].page
+    assert collapsed.index() == [["API", [["Reference", [
+        ["foo", [["a", "_ref/foo.a/"], ["b", "_ref/foo.b/"], ["bar", [["c", "_ref/foo.bar.c/"]]]]],
+        ["qux", "_ref/qux/"],
+    ]]]]]
@@ -1,2 +1,87 @@
-def test_placeholder():
-    ...
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from mkdocs.exceptions import PluginError
+from mkdocs.structure.files import get_files
+from mkdocs_autorefs import AutorefsPlugin
+
+from mkdocstrings_python_generator.plugin import GeneratePythonDocs
+from tests.conftest import PluginBuild
+
+
+def _write_sources(tmp_path: Path, count: int) -> List[Dict[str, Any]]:
+    source_dirs = []
+    for service in range(count):
+        package = tmp_path / f"service_{service}" / f"service_{service}"
+        (package / "api").mkdir(parents=True)
+        (package / "__init__.py").write_text('"""Service"""\n')
+        (package / "api" / "__init__.py").write_text('"""API"""\n')
+        for module in range(3):
+            (package / "api" / f"module_{module}.py").write_text("x = 1\n")
+        source_dirs.append({"base": str(package.parent)})
+    return source_dirs
+
+
+def _build(plugin_build: PluginBuild, plugin_config: Dict[str, Any]) -> tuple[List[str], str]:
+    with plugin_build.nav(plugin_config) as (_, files, nav):
+        return [file.src_uri for file in files], str(nav)
+
+
+def test_max_workers_is_deterministic(tmp_path: Path, plugin_build: PluginBuild):
+    source_dirs = _write_sources(tmp_path, 4)
+    serial = _build(plugin_build, {"source_dirs": source_dirs})
+    for _ in range(3):
+        assert _build(plugin_build, {"source_dirs": source_dirs, "max_workers": 4}) == serial
+    assert len(serial[0]) == 4 * 5
+
+
+def test_max_workers_must_be_positive(tmp_path: Path, plugin_build: PluginBuild):
+    with pytest.raises(PluginError):
+        _build(plugin_build, {"source_dirs": _write_sources(tmp_path, 1), "max_workers": 0})
+
+
+def test_cache_dir_keeps_manifest(tmp_path: Path, plugin_build: PluginBuild):
+    source_dirs = _write_sources(tmp_path, 2)
+    plugin_config = {"source_dirs": source_dirs, "cache_dir": ".cache"}
+    expected = _build(plugin_build, {"source_dirs": source_dirs})
+    assert _build(plugin_build, plugin_config) == expected
+    assert len(list((tmp_path / ".cache").glob("discovery-*.json"))) == 2
+    assert _build(plugin_build, plugin_config) == expected
+
+
+def test_processors_persist_between_builds(tmp_path: Path, plugin_build: PluginBuild):
+    config = plugin_build.load_config({"source_dirs": _write_sources(tmp_path, 2)})
+    plugin = config.plugins["mkdocstrings-python-generator"]
+    assert isinstance(plugin, GeneratePythonDocs)
+    try:
+        config = config.plugins.on_config(config)
+        config.plugins.on_files(get_files(config), config=config)
+        processors = list(plugin._source_processors)
+        removed_pages = processors[1].files_generator.base_path
+        assert removed_pages is not None and removed_pages.exists()
+
+        config = config.plugins.on_config(config)
+        assert plugin._source_processors == processors
+        assert all(processor.generated_files == {} for processor in processors)
+
+        # A source that is no longer configured has its pages deleted straight away
+        plugin.config.source_dirs.pop()
+        config = config.plugins.on_config(config)
+        assert plugin._source_processors == processors[:1]
+        assert not removed_pages.exists()
+    finally:
+        config.plugins.on_shutdown()
+
+
+def test_module_urls_registered_with_autorefs(tmp_path: Path, plugin_build: PluginBuild):
+    source_dirs = _write_sources(tmp_path, 1)
+    source_dirs[0]["shard_count"] = 2
+    with plugin_build.nav({"source_dirs": source_dirs}, ["autorefs"]) as (config, files, _):
+        autorefs = config.plugins["autorefs"]
+        assert isinstance(autorefs, AutorefsPlugin)
+        # Every module resolves before any page is rendered, including those of the other shard
+        module_ids = ["service_0", "service_0.api", *(f"service_0.api.module_{module}" for module in range(3))]
+        urls = [autorefs.get_item_url(module_id)[0] for module_id in module_ids]
+        assert urls == [f"_ref/{module_id.replace('.', '/')}/#{module_id}" for module_id in module_ids]
+        assert 0 < len([file for file in files if file.src_uri.startswith("_ref/")]) < len(module_ids)
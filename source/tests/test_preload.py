@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Any
+
+import yaml
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import get_files
+
+
+def _write_project(tmp_path: Path, preload_modules: bool = True) -> Path:
+    package = tmp_path / "source" / "package"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text('"""Package"""\n')
+    (package / "module.py").write_text('"""Module"""\n\n\ndef function() -> None:\n    """Function"""\n')
+    (tmp_path / "docs").mkdir(exist_ok=True)
+    config_file = tmp_path / "mkdocs.yml"
+    config_file.write_text(yaml.safe_dump({
+        "site_name": "Test",
+        "plugins": [
+            {"mkdocstrings": {"handlers": {"python": {"paths": [str(tmp_path / "source")]}}}},
+            {"mkdocstrings-python-generator": {
+                "source_dirs": [{"base": str(tmp_path / "source")}],
+                "preload_modules": preload_modules,
+            }},
+        ],
+    }))
+    return config_file
+
+
+def _on_files(config_file: Path) -> tuple[MkDocsConfig, Any]:
+    config = load_config(str(config_file))
+    config = config.plugins.on_config(config)
+    config.plugins.on_files(get_files(config), config=config)
+    return config, config.plugins["mkdocstrings"].get_handler("python")  # type: ignore[attr-defined]
+
+
+def test_preload_modules(tmp_path: Path):
+    config_file = _write_project(tmp_path)
+    config, handler = _on_files(config_file)
+    try:
+        assert handler._modules_collection["package.module.function"].docstring.value == "Function"
+    finally:
+        config.plugins.on_shutdown()
+
+
+def test_preload_modules_reused_by_next_build(tmp_path: Path):
+    config_file = _write_project(tmp_path)
+    config, handler = _on_files(config_file)
+    try:
+        modules = handler._modules_collection
+        config, handler = _on_files(config_file)
+        assert handler._modules_collection is modules
+
+        (tmp_path / "source" / "package" / "module.py").write_text('"""Changed"""\n')
+        config, handler = _on_files(config_file)
+        assert handler._modules_collection is not modules
+        assert "function" not in handler._modules_collection["package.module"].members
+    finally:
+        config.plugins.on_shutdown()
+
+
+def test_modules_not_preloaded_by_default(tmp_path: Path):
+    config, handler = _on_files(_write_project(tmp_path, preload_modules=False))
+    try:
+        assert "package" not in handler._modules_collection.members
+    finally:
+        config.plugins.on_shutdown()
@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from mkdocs.exceptions import PluginError
+from mkdocs.structure.files import File
+from mkdocs.structure.pages import Page
+
+from mkdocstrings_python_generator.prerender import Prerenderer
+from tests.conftest import PluginBuild
+
+
+def _build_site(plugin_build: PluginBuild, site_dir: str, plugin_config: Dict[str, Any]) -> Dict[str, bytes]:
+    source = str(plugin_build.tmp_path / "src")
+    site = plugin_build.site({"in_memory": True, "source_dirs": [{"base": source}], **plugin_config},
+                             [{"mkdocstrings": {"handlers": {"python": {"paths": [source]}}}}], site_dir=site_dir)
+    return {str(path.relative_to(site)): path.read_bytes() for path in (site / "foo").rglob("*") if path.is_file()}
+
+
+def test_prerendered_pages_match_serial_build(tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+                                              plugin_build: PluginBuild):
+    package = tmp_path / "src" / "foo"
+    package.mkdir(parents=True)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.md").write_text("# Home\n")
+    (package / "__init__.py").write_text('"""Foo"""\nfrom foo.bar import Bar\n')
+    (package / "bar.py").write_text('"""Bar"""\n\n\nclass Bar:\n    """See [foo.baz.baz][]"""\n')
+    (package / "baz.py").write_text('"""Baz"""\n\n\ndef baz() -> int:\n    """Baz"""\n    return 1\n')
+
+    serial = _build_site(plugin_build, "serial", {})
+    taken: List[bool] = []
+    take = Prerenderer.take
+
+    def record_take(self: Prerenderer, page: Page) -> bool:
+        taken.append(take(self, page))
+        return taken[-1]
+
+    monkeypatch.setattr(Prerenderer, "take", record_take)
+    prerendered = _build_site(plugin_build, "prerendered", {"prerender_workers": 2})
+    assert taken == [False, True, True, True]  # index.md is not generated
+    assert sorted(prerendered) == sorted(serial)
+    for path, content in serial.items():
+        assert prerendered[path] == content, path
+    assert (tmp_path / "prerendered" / "objects.inv").read_bytes() == (tmp_path / "serial" / "objects.inv").read_bytes()
+
+
+def test_unknown_pages_are_not_taken(tmp_path: Path):
+    class FakeFile:
+        src_uri = "foo.md"
+
+    class FakePage:
+        file = FakeFile()
+
+    prerenderer = Prerenderer()
+    assert not prerenderer.take(FakePage())  # type: ignore
+    assert prerenderer.apply("<p>html</p>", FakePage(), None, None) == "<p>html</p>"  # type: ignore
+
+
+def test_prerender_requires_mkdocs_1_6(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, plugin_build: PluginBuild):
+    (tmp_path / "src").mkdir()
+    monkeypatch.delattr(File, "generated")  # Added by mkdocs 1.6
+    config = plugin_build.load_config({"prerender_workers": 2, "source_dirs": [{"base": str(tmp_path / "src")}]})
+    with pytest.raises(PluginError):
+        config.plugins.on_config(config)
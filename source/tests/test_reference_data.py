@@ -1,3 +1,4 @@
+import pickle
 from pathlib import Path
 
 from mkdocstrings_python_generator import reference_data
@@ -66,3 +67,34 @@ def test_module_ref_module_path_must_be_in_base_path(tmp_path: Path) -> None:
     module_path = tmp_path / "bar" / "baz.py"
     with pytest.raises(ValueError):
         _ = reference_data.ModuleRef(base_path, module_path)
+
+
+def test_module_ref_from_parts_matches_path(tmp_path: Path) -> None:
+    from_path = reference_data.ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")
+    from_parts = reference_data.ModuleRef.from_parts(tmp_path, ("foo", "bar.py"))
+
+    assert from_parts == from_path
+    assert hash(from_parts) == hash(from_path)
+    assert from_parts.module_path == tmp_path / "foo" / "bar.py"
+    assert from_parts.parts == ("foo", "bar.py")
+    assert from_parts != reference_data.ModuleRef.from_parts(tmp_path, ("foo", "baz.py"))
+
+
+def test_module_ref_shares_segments(tmp_path: Path) -> None:
+    first = reference_data.ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")
+    second = reference_data.ModuleRef(tmp_path, tmp_path / "foo" / "baz.py")
+
+    assert first.ref_path[0] is second.ref_path[0]
+
+
+def test_module_ref_is_immutable(tmp_path: Path) -> None:
+    module_reference = reference_data.ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")
+    with pytest.raises(AttributeError):
+        module_reference.module_id = "foo.baz"  # type: ignore[misc]
+    assert not hasattr(module_reference, "__dict__")
+
+
+def test_module_ref_pickles(tmp_path: Path) -> None:
+    module_reference = reference_data.ModuleRef(tmp_path, tmp_path / "foo" / "__init__.py")
+
+    assert pickle.loads(pickle.dumps(module_reference)) == module_reference
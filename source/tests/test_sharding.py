@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+import pytest
+from mkdocs.exceptions import PluginError
+from mkdocs.structure import StructureItem
+from mkdocs.structure.nav import Link, Page, Section
+
+from mkdocstrings_python_generator.sharding import shard_of
+from tests.conftest import PluginBuild
+
+
+def test_shard_of_is_stable():
+    # Every shard must agree, whatever the machine or python version
+    assert [shard_of(module_id, 4) for module_id in ("foo", "foo.bar", "foo.baz")] == [1, 3, 1]
+
+
+def _write_package(tmp_path: Path) -> None:
+    package = tmp_path / "source" / "package"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("x = 1\n")
+    for module in range(20):
+        (package / f"module_{module}.py").write_text("x = 1\n")
+
+
+def _build(plugin_build: PluginBuild, source_options: Dict[str, Any]) -> tuple[Set[str], Dict[str, str]]:
+    plugin_config = {"source_dirs": [{"base": str(plugin_build.tmp_path / "source"), **source_options}]}
+    with plugin_build.nav(plugin_config) as (_, files, nav):
+        return {file.src_uri for file in files}, _nav_urls(nav.items)
+
+
+def _nav_urls(items: List[StructureItem], prefix: str = "") -> Dict[str, str]:
+    urls = {}
+    for item in items:
+        if isinstance(item, Section):
+            urls.update(_nav_urls(item.children, f"{prefix}{item.title}/"))
+        elif isinstance(item, (Page, Link)):
+            urls[f"{prefix}{item.title}"] = item.url
+    return urls
+
+
+def test_shards_cover_every_module(tmp_path: Path, plugin_build: PluginBuild):
+    _write_package(tmp_path)
+    everything, full_nav = _build(plugin_build, {})
+    shards = [_build(plugin_build, {"shard_index": index, "shard_count": 3}) for index in range(3)]
+
+    shard_files = [files for files, _ in shards]
+    assert set().union(*shard_files) == everything
+    assert sum(len(files) for files in shard_files) == len(everything)
+    for files, nav in shards:
+        assert files != everything
+        # Every shard has the nav of the whole tree, linking to pages built by the others
+        assert nav == full_nav
+
+
+def test_shard_index_must_be_in_range(tmp_path: Path, plugin_build: PluginBuild):
+    _write_package(tmp_path)
+    with pytest.raises(PluginError):
+        _build(plugin_build, {"shard_index": 2, "shard_count": 2})
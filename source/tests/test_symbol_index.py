@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import yaml
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+
+from mkdocstrings_python_generator import files_generator
+from mkdocstrings_python_generator.module_scan import ModuleScanner
+from mkdocstrings_python_generator.reference_data import ModuleRef
+from mkdocstrings_python_generator.symbol_index import module_symbols
+
+
+def _write_package(source: Path) -> None:
+    (source / "foo").mkdir(parents=True)
+    (source / "foo" / "__init__.py").write_text('"""The foo package\n\nMore about foo\n"""\n')
+    (source / "foo" / "bar.py").write_text('"""Bar"""\n\n\nclass Bar:\n    """A bar"""\n\n\ndef baz():\n    pass\n')
+
+
+def test_module_symbols(tmp_path: Path):
+    _write_package(tmp_path)
+    module_refs = [ModuleRef(tmp_path, tmp_path / "foo" / "bar.py"),
+                   ModuleRef(tmp_path, tmp_path / "foo" / "__init__.py")]
+    generator = files_generator.FilesGenerator(str(tmp_path / "site"), use_directory_urls=True, in_memory=True)
+    split = files_generator.SplitModules(members=lambda module_ref: ("Bar", ) if module_ref == module_refs[0] else (),
+                                         overview_template="::: {module_id}\n", member_template="::: {member_name}\n")
+    file_refs = list(generator.generate_pages(module_refs, "::: {module_id}\n", split=split))
+
+    assert module_symbols(file_refs, ModuleScanner("none")) == [
+        {"id": "foo", "name": "foo", "summary": "The foo package", "url": "_ref/foo/", "members": []},
+        {"id": "foo.bar", "name": "bar", "summary": "Bar", "url": "_ref/foo/bar/", "members": [
+            # A member with a page of its own links to it
+            {"id": "foo.bar.Bar", "name": "Bar", "summary": "A bar", "url": "_ref/foo/bar.Bar/#foo.bar.Bar"},
+            {"id": "foo.bar.baz", "name": "baz", "summary": "", "url": "_ref/foo/bar/#foo.bar.baz"},
+        ]},
+    ]
+
+
+def test_compact_search(tmp_path: Path):
+    _write_package(tmp_path / "src")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.md").write_text("# Home\n\nWelcome\n")
+    config_file = tmp_path / "mkdocs.yml"
+    config_file.write_text(yaml.safe_dump({
+        "site_name": "Test",
+        "plugins": [
+            "search",
+            {"mkdocstrings": {"handlers": {"python": {"paths": [str(tmp_path / "src")]}}}},
+            {"mkdocstrings-python-generator": {"in_memory": True,
+                                               "source_dirs": [{"base": str(tmp_path / "src"), "search": "compact"}]}},
+        ],
+    }))
+    config = load_config(str(config_file), site_dir=str(tmp_path / "site"))
+    try:
+        build(config)
+    finally:
+        config.plugins.on_shutdown()
+
+    search_index = json.loads((tmp_path / "site" / "search" / "search_index.json").read_text())
+    # The rendered reference pages are replaced by an entry for each module and member
+    assert [(doc["location"], doc["title"], doc["text"]) for doc in search_index["docs"]] == [
+        ("", "Home", "Home Welcome"),
+        ("#home", "Home", "Welcome"),
+        ("_ref/foo/", "foo", "The foo package"),
+        ("_ref/foo/bar/", "foo.bar", "Bar"),
+        ("_ref/foo/bar/#foo.bar.Bar", "foo.bar.Bar", "A bar"),
+        ("_ref/foo/bar/#foo.bar.baz", "foo.bar.baz", ""),
+    ]
+    symbols = json.loads((tmp_path / "site" / "reference_symbols.json").read_text())
+    assert [module["id"] for module in symbols["modules"]] == ["foo", "foo.bar"]
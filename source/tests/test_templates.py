@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+
+import pytest
+from mkdocs.exceptions import PluginError
+
+from mkdocstrings_python_generator import files_generator, templates
+from mkdocstrings_python_generator.reference_data import ModuleRef
+
+
+def test_page_context(tmp_path: Path):
+    context = templates.page_context(ModuleRef(tmp_path, tmp_path / "foo" / "bar" / "__init__.py"))
+    assert context["module_id"] == "foo.bar"
+    assert context["module_name"] == "bar"
+    assert context["parent_id"] == "foo"
+    assert context["id_parts"] == ["foo", "bar"]
+    assert context["is_package"] is True
+    assert context["source_path"] == "foo/bar/__init__.py"
+
+
+def test_loader_compiles_once_until_changed(tmp_path: Path):
+    path = tmp_path / "module.md.j2"
+    path.write_text("# {{ module_name }}\n")
+    loader = templates.TemplateLoader()
+    template = loader.load(str(path))
+    assert loader.load(str(path)) is template
+
+    path.write_text("## {{ module_id }}\n")
+    os.utime(path, ns=(0, 0))
+    changed = loader.load(str(path))
+    assert changed is not template
+    context = templates.page_context(ModuleRef(tmp_path, tmp_path / "foo" / "bar.py"))
+    assert templates.render_page(changed, context) == "## foo.bar\n"
+
+
+def test_loader_reports_bad_templates(tmp_path: Path):
+    path = tmp_path / "module.md.j2"
+    path.write_text("{% if %}\n")
+    with pytest.raises(PluginError):
+        templates.TemplateLoader().load(str(path))
+    with pytest.raises(PluginError):
+        templates.TemplateLoader().load(str(tmp_path / "missing.md.j2"))
+
+
+def test_render_reports_undefined_names(tmp_path: Path):
+    path = tmp_path / "module.md.j2"
+    path.write_text("{{ modul_id }}\n")
+    template = templates.TemplateLoader().load(str(path))
+    with pytest.raises(PluginError):
+        templates.render_page(template, templates.page_context(ModuleRef(tmp_path, tmp_path / "foo.py")))
+
+
+def test_package_template(tmp_path: Path):
+    (tmp_path / "foo").mkdir()
+    (tmp_path / "foo" / "__init__.py").write_text("")
+    (tmp_path / "foo" / "bar.py").write_text("")
+    package_path = tmp_path / "package.md.j2"
+    package_path.write_text("{% if is_package %}package {{ module_id }}{% endif %}\n")
+    generator = files_generator.FilesGenerator(str(tmp_path / "site"), use_directory_urls=True, in_memory=True)
+    module_refs = [ModuleRef(tmp_path, tmp_path / "foo" / "__init__.py"),
+                   ModuleRef(tmp_path, tmp_path / "foo" / "bar.py")]
+    generated = list(generator.generate_pages(module_refs, "module {module_id}\n",
+                                              package_template=templates.TemplateLoader().load(str(package_path))))
+    assert [ref.file.content_string for ref in generated] == ["package foo\n", "module foo.bar\n"]